@@ -6,38 +6,291 @@ files inside the VM. Designed to be called by the injection MCP server on the
 host for red-teaming environment setup.
 
 Usage:
-    uv run main.py [--port PORT]
+    uv run main.py [--port PORT] [--workers N]
     # or
-    python main.py [--port PORT]
+    python main.py [--port PORT] [--workers N]
+
+Runs one worker process per CPU by default. The document cache is per
+worker; edits to the same file from different workers are serialised with
+an OS file lock.
 """
 
 from __future__ import annotations
 
 import copy
+import hashlib
+import os
+import re
+import shutil
 import sys
-from pathlib import Path
-from typing import Any, Dict, List, Optional
-
+import tempfile
+import threading
+import time
+import zipfile
+from bisect import bisect_right
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Literal, Optional, Set, Tuple, Union
+
+import anyio.to_thread
+import orjson
 import uvicorn
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+
+# Parts that are already compressed (images, media, embedded packages) gain
+# nothing from deflate but dominate save time on media-heavy documents.
+_STORED_EXTENSIONS = frozenset((
+    ".png", ".jpg", ".jpeg", ".gif", ".tif", ".tiff", ".wdp",
+    ".mp3", ".mp4", ".m4a", ".mov", ".wmv", ".avi",
+    ".zip", ".docx", ".xlsx", ".pptx",
+))
+
+
+# Deflate level for the XML parts of saved documents. Level 1 makes files
+# ~20% larger than zlib's default 6 but is noticeably cheaper to produce.
+SAVE_COMPRESSLEVEL = 1
+
+
+class _PackageZipFile(zipfile.ZipFile):
+    """ZipFile the document backends save through.
+
+    Deflates at SAVE_COMPRESSLEVEL and stores media uncompressed.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        kwargs.setdefault("compresslevel", SAVE_COMPRESSLEVEL)
+        super().__init__(*args, **kwargs)
+
+    def writestr(self, zinfo_or_arcname, data, compress_type=None, compresslevel=None):
+        if (
+            compress_type is None
+            and isinstance(zinfo_or_arcname, str)
+            and os.path.splitext(zinfo_or_arcname)[1].lower() in _STORED_EXTENSIONS
+        ):
+            compress_type = zipfile.ZIP_STORED
+        super().writestr(zinfo_or_arcname, data, compress_type, compresslevel)
+
+
+# Document backends. A missing one only disables its own endpoints (503).
+_MISSING_BACKENDS: Dict[str, str] = {}
+
+try:
+    import docx.opc.phys_pkg
+    from docx import Document
+    from docx.oxml.ns import nsmap, qn
+    from docx.shared import Pt
+    from docx.shared import RGBColor as DocxRGBColor
+    from lxml.etree import SubElement, XPath
+
+    _W_R, _W_T, _XML_SPACE = qn("w:r"), qn("w:t"), qn("xml:space")
+    _W_HYPERLINK, _W_RPR, _W_RSTYLE = qn("w:hyperlink"), qn("w:rPr"), qn("w:rStyle")
+    _W_VAL, _R_ID = qn("w:val"), qn("r:id")
+    _HYPERLINK_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink"
+    _W_P = qn("w:p")
+    # The run content python-docx renders as Paragraph.text, for every body
+    # paragraph at once (runs directly in the paragraph or in a hyperlink).
+    _RUN_CONTENT = "*[self::w:t or self::w:tab or self::w:br or self::w:cr or self::w:ptab or self::w:noBreakHyphen]"
+    _BODY_PARAGRAPH_TEXT = XPath(
+        f"./w:p/w:r/{_RUN_CONTENT} | ./w:p/w:hyperlink/w:r/{_RUN_CONTENT}",
+        namespaces={"w": nsmap["w"]},
+    )
+    # The <w:t> nodes of a paragraph's own runs, in document order.
+    _PARAGRAPH_RUN_TEXT = XPath("./w:r/w:t", namespaces={"w": nsmap["w"]})
+
+    docx.opc.phys_pkg.ZipFile = _PackageZipFile
+except ImportError as e:  # pragma: no cover
+    _MISSING_BACKENDS["python-docx"] = str(e)
+
+try:
+    import openpyxl.writer.excel
+    from openpyxl import Workbook, load_workbook
+    from openpyxl.styles import Font, PatternFill
+    from openpyxl.utils import range_boundaries
+
+    openpyxl.writer.excel.ZipFile = _PackageZipFile
+except ImportError as e:  # pragma: no cover
+    _MISSING_BACKENDS["openpyxl"] = str(e)
+
+try:
+    from pptx import Presentation
+    from pptx.dml.color import RGBColor as PptxRGBColor
+    from pptx.enum.shapes import MSO_SHAPE
+    from pptx.opc import serialized as pptx_serialized
+    from pptx.oxml.ns import qn as pptx_qn
+    from pptx.util import lazyproperty
+    from lxml.etree import SubElement
+
+    _A_R, _A_T = pptx_qn("a:r"), pptx_qn("a:t")
+    # Shape geometry is passed as raw EMU ints rather than Inches() objects.
+    _EMU_PER_INCH = 914400
+    # r:embed, r:link, r:id, ... all share this namespace.
+    _R_ATTR_PREFIX = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+    # spTree children that describe the tree itself rather than a shape.
+    _SPTREE_NON_SHAPES = frozenset(pptx_qn(t) for t in ("p:nvGrpSpPr", "p:grpSpPr", "p:extLst"))
+
+    # add_shape's shape_type values (unknown names fall back to a rectangle).
+    _SHAPE_MAP = {
+        "rectangle": MSO_SHAPE.RECTANGLE,
+        "rounded_rectangle": MSO_SHAPE.ROUNDED_RECTANGLE,
+        "oval": MSO_SHAPE.OVAL,
+        "triangle": MSO_SHAPE.ISOSCELES_TRIANGLE,
+        "diamond": MSO_SHAPE.DIAMOND,
+        "pentagon": MSO_SHAPE.PENTAGON,
+        "hexagon": MSO_SHAPE.HEXAGON,
+        "cloud": MSO_SHAPE.CLOUD,
+        "star": MSO_SHAPE.STAR_5_POINT,
+        "arrow_right": MSO_SHAPE.RIGHT_ARROW,
+        "arrow_left": MSO_SHAPE.LEFT_ARROW,
+    }
+
+    def _pptx_zipf(self: Any) -> zipfile.ZipFile:
+        return _PackageZipFile(self._pkg_file, "w", compression=zipfile.ZIP_DEFLATED, strict_timestamps=False)
+
+    pptx_serialized._ZipPkgWriter._zipf = lazyproperty(_pptx_zipf)
+except ImportError as e:  # pragma: no cover
+    _MISSING_BACKENDS["python-pptx"] = str(e)
+
+# Worker threads available for blocking document I/O (anyio defaults to 40).
+THREADPOOL_SIZE = 64
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    yield
+    # Don't lose PowerPoint edits that were sent with commit=false.
+    await anyio.to_thread.run_sync(flush_all)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response encoded with orjson.
+
+    Handlers return this directly (see ok()), which skips FastAPI's
+    response-model validation and serialisation; response_model=ApiResponse
+    stays on the routes to document the shape. It is also the app's default
+    response class, for routes that return plain values.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content)
+
 
 app = FastAPI(
     title="Office Service API",
     description="Lightweight API for creating/reading Office documents in the VM",
     version="0.2.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 
+class RequestError(Exception):
+    """Raised by blocking handlers for invalid requests (mapped to HTTP 400).
+
+    Handlers raise it before changing the document, so the cached object
+    stays usable.
+    """
+
+    status_code = 400
+
+
+class DocumentConflict(RequestError):
+    """Deferred edits can't be saved because the file changed on disk (HTTP 409)."""
+
+    status_code = 409
+
+
+# Route handlers let exceptions propagate; these turn them into the same
+# {"detail": ...} bodies HTTPException produces.
+@app.exception_handler(RequestError)
+async def _request_error(request: Request, exc: RequestError) -> ORJSONResponse:
+    return ORJSONResponse({"detail": str(exc)}, status_code=exc.status_code)
+
+
+@app.exception_handler(Exception)
+async def _internal_error(request: Request, exc: Exception) -> ORJSONResponse:
+    return ORJSONResponse({"detail": str(exc)}, status_code=500)
+
+
+def _require_backend(name: str) -> List[Any]:
+    """Route dependencies that answer 503 when a document backend is missing."""
+    def check() -> None:
+        if name in _MISSING_BACKENDS:
+            raise HTTPException(status_code=503, detail=f"{name} is not installed: {_MISSING_BACKENDS[name]}")
+    return [Depends(check)]
+
+
+_NEEDS_DOCX = _require_backend("python-docx")
+_NEEDS_OPENPYXL = _require_backend("openpyxl")
+_NEEDS_PPTX = _require_backend("python-pptx")
+
+
+# Table cell text without tabs, breaks or control characters can be written as
+# a single <r><t> pair; anything else goes through the library's text setter.
+_NEEDS_TEXT_SETTER = re.compile(r"[\x00-\x1f]").search
+
+
+async def _offload(func: Callable[[Any], Response], req: BaseModel) -> Response:
+    """Run a blocking handler on the worker pool."""
+    return await run_in_threadpool(func, req)
+
+
 # ── Request / Response models ────────────────────────────────
 
 
+# A table or sheet cell as sent in JSON: scalars only.
+CellValue = Union[str, int, float, bool, None]
+
+
 class ApiResponse(BaseModel):
     status: str = "success"
     message: str = ""
     data: Optional[dict] = None
 
 
+def ok(message: str, data: Optional[dict] = None) -> ORJSONResponse:
+    return ORJSONResponse({"status": "success", "message": message, "data": data})
+
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def stream_ok(data: Dict[str, List[Any]]) -> StreamingResponse:
+    """Stream a successful ApiResponse whose data values are lists.
+
+    Items are encoded one at a time and flushed in ~64 KiB chunks, so the
+    whole JSON body is never held in memory next to the extracted text.
+    """
+    async def body() -> AsyncIterator[bytes]:
+        buf = [b'{"status":"success","message":"OK","data":{']
+        size = 0
+        for i, (key, items) in enumerate(data.items()):
+            buf.append((b',"' if i else b'"') + key.encode() + b'":[')
+            for j, item in enumerate(items):
+                chunk = orjson.dumps(item)
+                buf.append(b"," + chunk if j else chunk)
+                size += len(chunk)
+                if size >= STREAM_CHUNK_SIZE:
+                    yield b"".join(buf)
+                    buf.clear()
+                    size = 0
+            buf.append(b"]")
+        buf.append(b"}}")
+        yield b"".join(buf)
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
 # -- Word models --
 
 class CreateWordRequest(BaseModel):
@@ -65,7 +318,7 @@ class ReadWordRequest(BaseModel):
 class AddWordTableRequest(BaseModel):
     file_path: str
     headers: List[str] = Field(default_factory=list)
-    rows: List[List[str]] = Field(default_factory=list)
+    rows: List[List[CellValue]] = Field(default_factory=list)
     style: Optional[str] = None
 
 
@@ -102,12 +355,21 @@ class AddWordHeaderFooterRequest(BaseModel):
     footer_text: Optional[str] = None
 
 
+class WordParagraphArgs(BaseModel):
+    text: str = ""
+
+
+class WordHeadingArgs(BaseModel):
+    text: str = ""
+    level: int = 1
+
+
 # -- Excel models --
 
 class SheetData(BaseModel):
     name: str = "Sheet1"
     headers: List[str] = Field(default_factory=list)
-    rows: List[List[str]] = Field(default_factory=list)
+    rows: List[List[CellValue]] = Field(default_factory=list)
     hidden: bool = False
 
 
@@ -120,7 +382,7 @@ class WriteExcelDataRequest(BaseModel):
     file_path: str
     sheet_name: str = "Sheet1"
     headers: List[str] = Field(default_factory=list)
-    rows: List[List[str]] = Field(default_factory=list)
+    rows: List[List[CellValue]] = Field(default_factory=list)
     hidden: bool = False
 
 
@@ -188,21 +450,29 @@ class AddSlideRequest(BaseModel):
     title: str = ""
     content: str = ""
     notes: str = ""
+    commit: bool = True
 
 
 class ReadPptxRequest(BaseModel):
     file_path: str
+    # False returns each slide's text as a list with one entry per shape.
+    joined: bool = True
+
+
+class FlushPptxRequest(BaseModel):
+    file_path: str
 
 
 class AddPptxTableRequest(BaseModel):
     file_path: str
     slide_index: int
     headers: List[str] = Field(default_factory=list)
-    rows: List[List[str]] = Field(default_factory=list)
+    rows: List[List[CellValue]] = Field(default_factory=list)
     left: float = 1.0
     top: float = 2.0
     width: float = 8.0
     height: float = 3.0
+    commit: bool = True
 
 
 class UpdateSlideContentRequest(BaseModel):
@@ -211,22 +481,26 @@ class UpdateSlideContentRequest(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None
     notes: Optional[str] = None
+    commit: bool = True
 
 
 class DeleteSlideRequest(BaseModel):
     file_path: str
     slide_index: int
+    commit: bool = True
 
 
 class DuplicateSlideRequest(BaseModel):
     file_path: str
     slide_index: int
+    commit: bool = True
 
 
 class SetSlideNotesRequest(BaseModel):
     file_path: str
     slide_index: int
     notes: str
+    commit: bool = True
 
 
 class GetSlideInfoRequest(BaseModel):
@@ -244,6 +518,462 @@ class AddPptxShapeRequest(BaseModel):
     height: float = 1.0
     text: str = ""
     fill_color: Optional[str] = None
+    commit: bool = True
+
+
+# -- Batch models --
+#
+# Each op's args are validated against the single-call request model of the
+# same operation (file_path is taken from the batch).
+
+class WordOp(BaseModel):
+    op: Literal[
+        "add_paragraph", "add_heading", "add_table", "format", "hyperlink",
+        "page_break", "header_footer", "search_replace", "delete_paragraph",
+    ]
+    args: dict = Field(default_factory=dict)
+
+
+class WordBatchRequest(BaseModel):
+    file_path: str
+    ops: List[WordOp] = Field(default_factory=list)
+    create_if_missing: bool = True
+
+
+class ExcelOp(BaseModel):
+    op: Literal[
+        "write_data", "apply_formula", "format_range", "merge_cells",
+        "delete_sheet", "rename_sheet", "insert_rows", "insert_cols",
+    ]
+    args: dict = Field(default_factory=dict)
+
+
+class ExcelBatchRequest(BaseModel):
+    file_path: str
+    ops: List[ExcelOp] = Field(default_factory=list)
+    create_if_missing: bool = True
+
+
+class PptxOp(BaseModel):
+    op: Literal[
+        "add_slide", "add_table", "update_slide", "delete_slide",
+        "duplicate_slide", "set_notes", "add_shape",
+    ]
+    args: dict = Field(default_factory=dict)
+
+
+class PptxBatchRequest(BaseModel):
+    file_path: str
+    ops: List[PptxOp] = Field(default_factory=list)
+    create_if_missing: bool = True
+    commit: bool = True
+
+
+# ── Parsed document cache ────────────────────────────────────
+#
+# Setup scripts typically issue many calls against the same file, so parsed
+# Document / Workbook / Presentation objects are kept between requests and
+# reused as long as the file on disk is unchanged. Cached objects are shared
+# between worker threads and are not thread-safe: every handler touching a
+# file holds locked_document(path) from load to save. The cache belongs to one
+# worker process; the file-signature check picks up saves made by the others.
+#
+# At most DOC_CACHE_SIZE objects are kept. Entries unused for DOC_CACHE_TTL
+# seconds are dropped whenever the cache is consulted (any load or save), so
+# memory held by idle documents is released on the next request. A worker that
+# gets no requests at all keeps its entries until it does.
+#
+# PowerPoint edits sent with commit=false are not saved: the object is pinned
+# in _dirty_docs (exempt from LRU/TTL eviction) until a committing edit,
+# /pptx/flush or shutdown writes it out. Pinned edits are only visible to the
+# worker that made them, so commit=false is refused unless the service runs a
+# single worker (--workers 1). A pinned object remembers the file signature
+# its edits are based on; if the file changes on disk anyway, the edits are
+# discarded with a DocumentConflict rather than overwriting the newer file.
+# Invalid requests (RequestError) and reads leave pinned edits alone; an
+# unexpected failure while editing discards them with the rest of the object.
+
+DOC_CACHE_SIZE = 32
+DOC_CACHE_TTL = 30.0  # seconds since last use
+
+_doc_cache: "OrderedDict[str, Tuple[Tuple[int, int], Any, float]]" = OrderedDict()
+_dirty_docs: Dict[str, Tuple[str, Any, Optional[Tuple[int, int]]]] = {}
+_doc_cache_lock = threading.Lock()
+_path_locks: Dict[str, threading.Lock] = {}
+
+# Lock files live outside the document directories so no stray files appear
+# next to the documents.
+_LOCK_DIR = os.path.join(tempfile.gettempdir(), "office-service-locks")
+
+
+def _cache_key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _file_signature(path: str) -> Tuple[int, int]:
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _disk_signature(path: str) -> Optional[Tuple[int, int]]:
+    """Like _file_signature, but None for a file that doesn't exist."""
+    try:
+        return _file_signature(path)
+    except FileNotFoundError:
+        return None
+
+
+def _cache_put(path: str, obj: Any, signature: Tuple[int, int]) -> None:
+    """Cache obj as the parsed form of path as it was at signature."""
+    key = _cache_key(path)
+    now = time.monotonic()
+    with _doc_cache_lock:
+        _dirty_docs.pop(key, None)
+        _doc_cache[key] = (signature, obj, now)
+        _doc_cache.move_to_end(key)
+        _prune_cache(now)
+
+
+def _prune_cache(now: float) -> None:
+    """Drop expired and over-capacity entries; call with _doc_cache_lock held."""
+    # Least recently used first, so expired entries sit at the front.
+    while _doc_cache and (
+        len(_doc_cache) > DOC_CACHE_SIZE or now - next(iter(_doc_cache.values()))[2] > DOC_CACHE_TTL
+    ):
+        _doc_cache.popitem(last=False)
+
+
+def _pinned(path: str) -> Optional[Any]:
+    """The object holding deferred edits to path, if any.
+
+    Raises DocumentConflict (and drops the edits) if the file was changed on
+    disk since they were made.
+    """
+    with _doc_cache_lock:
+        dirty = _dirty_docs.get(_cache_key(path))
+    if dirty is None:
+        return None
+    if _disk_signature(path) != dirty[2]:
+        evict_cached(path)
+        raise DocumentConflict(
+            f"{path} was changed on disk after edits were deferred with commit=false; "
+            "those edits were discarded"
+        )
+    return dirty[1]
+
+
+def _load_cached(path: str, loader: Callable[[str], Any]) -> Any:
+    key = _cache_key(path)
+    pinned = _pinned(path)
+    if pinned is not None:
+        return pinned
+    signature = _file_signature(path)
+    now = time.monotonic()
+    with _doc_cache_lock:
+        _prune_cache(now)
+        entry = _doc_cache.get(key)
+        if entry is not None and entry[0] == signature:
+            _doc_cache[key] = (signature, entry[1], now)
+            _doc_cache.move_to_end(key)
+            return entry[1]
+    # Cache under the signature taken before parsing: if the file is saved
+    # elsewhere meanwhile, the next lookup sees the mismatch and reparses.
+    obj = loader(path)
+    _cache_put(path, obj, signature)
+    return obj
+
+
+def evict_cached(path: str) -> None:
+    key = _cache_key(path)
+    with _doc_cache_lock:
+        _doc_cache.pop(key, None)
+        _dirty_docs.pop(key, None)
+
+
+def has_pending_edits(path: str) -> bool:
+    with _doc_cache_lock:
+        return _cache_key(path) in _dirty_docs
+
+
+def _mark_dirty(path: str, obj: Any) -> None:
+    """Keep an edited object in memory without saving it."""
+    key = _cache_key(path)
+    # Called under the file lock, so the file is still the one obj was loaded
+    # from (or still missing, for a new document).
+    signature = _disk_signature(path)
+    with _doc_cache_lock:
+        _doc_cache.pop(key, None)
+        dirty = _dirty_docs.get(key)
+        _dirty_docs[key] = (path, obj, dirty[2] if dirty is not None else signature)
+
+
+@contextmanager
+def _process_lock(key: str) -> Iterator[None]:
+    """Exclusive OS-level lock on key, shared by all worker processes."""
+    lock_path = os.path.join(_LOCK_DIR, hashlib.sha1(key.encode()).hexdigest())
+    try:
+        f = open(lock_path, "a+b")
+    except FileNotFoundError:
+        os.makedirs(_LOCK_DIR, exist_ok=True)
+        f = open(lock_path, "a+b")
+    with f:
+        if sys.platform == "win32":
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after ~10s; keep waiting
+                    pass
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@contextmanager
+def locked_document(path: str, read_only: bool = False) -> Iterator[None]:
+    """Serialise access to one file.
+
+    If an edit fails unexpectedly, its cached object is dropped. RequestErrors
+    are raised before anything changes, and read_only bodies never change
+    the object, so those keep it (and any deferred edits).
+    """
+    key = _cache_key(path)
+    with _doc_cache_lock:
+        lock = _path_locks.setdefault(key, threading.Lock())
+    with lock, _process_lock(key):
+        try:
+            yield
+        except RequestError:
+            raise
+        except BaseException:
+            if not read_only:
+                # The in-memory tree may be half-modified; force a reparse.
+                evict_cached(path)
+            raise
+
+
+def load_docx(path: str) -> Any:
+    return _load_cached(path, Document)
+
+
+def load_xlsx(path: str) -> Any:
+    # Default keep_links: the workbook is written back, and dropping the
+    # links would delete the file's external link parts.
+    return _load_cached(path, load_workbook)
+
+
+def load_pptx(path: str) -> Any:
+    return _load_cached(path, Presentation)
+
+
+def _atomic_save(obj: Any, path: str) -> None:
+    """Save next to path and rename over it, so a failed save never leaves a
+    truncated file behind.
+
+    A symlinked path updates the file it points to, and an existing file
+    keeps its permission bits.
+    """
+    target = os.path.realpath(path)
+    tmp = target + ".tmp.partial"
+    try:
+        obj.save(tmp)
+        if os.path.exists(target):
+            shutil.copymode(target, tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _can_resave(obj: Any) -> bool:
+    # openpyxl reads a loaded image from a stream that saving closes, so a
+    # saved workbook with images can't be saved a second time.
+    return not any(ws._images for ws in getattr(obj, "worksheets", ()))
+
+
+def save_cached(obj: Any, path: str) -> None:
+    """Save a document and keep it hot in the cache under its new mtime.
+
+    Objects that can't be saved again are dropped instead; the next request
+    reparses the file.
+    """
+    _atomic_save(obj, path)
+    if _can_resave(obj):
+        _cache_put(path, obj, _file_signature(path))
+    else:
+        evict_cached(path)
+
+
+# Set by the entry point for its worker processes.
+WORKERS_ENV = "OFFICE_SERVICE_WORKERS"
+
+
+def _check_commit_mode(req: BaseModel) -> None:
+    if not getattr(req, "commit", True) and int(os.environ.get(WORKERS_ENV, "1")) > 1:
+        raise RequestError("commit=false needs a single worker process; start the service with --workers 1")
+
+
+def _commit(obj: Any, req: BaseModel) -> None:
+    if getattr(req, "commit", True):
+        save_cached(obj, req.file_path)
+    else:
+        _mark_dirty(req.file_path, obj)
+
+
+def flush_document(path: str) -> bool:
+    """Save deferred edits to path, if any. Returns whether anything was written."""
+    # read_only: a failed save leaves the edits pinned for another attempt.
+    with locked_document(path, read_only=True):
+        obj = _pinned(path)
+        if obj is None:
+            return False
+        save_cached(obj, path)
+        return True
+
+
+def flush_all() -> None:
+    """Flush every file with deferred edits; report all conflicts at the end."""
+    with _doc_cache_lock:
+        paths = [dirty[0] for dirty in _dirty_docs.values()]
+    conflicts = []
+    for path in paths:
+        try:
+            flush_document(path)
+        except DocumentConflict as e:
+            conflicts.append(str(e))
+    if conflicts:
+        raise DocumentConflict("; ".join(conflicts))
+
+
+# ── Conditional reads ────────────────────────────────────────
+#
+# Read endpoints tag their response with an ETag derived from the file's
+# mtime/size and the request options. A client sending it back in
+# If-None-Match gets a 304 without the file being opened, and the extracted
+# data of recent reads is memoised so untagged repeats skip the parse too.
+# Files with deferred edits are not tagged: the disk copy is stale.
+
+READ_CACHE_SIZE = 64
+
+_read_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+_read_cache_lock = threading.Lock()
+
+
+def _read_etag(req: BaseModel) -> Optional[str]:
+    if has_pending_edits(req.file_path):
+        return None
+    mtime, size = _file_signature(req.file_path)
+    options = hashlib.sha1(req.model_dump_json().encode()).hexdigest()[:12]
+    return f'"{mtime:x}-{size:x}-{options}"'
+
+
+def _etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or "W/" + etag in tags
+
+
+def _conditional_read(
+    req: BaseModel,
+    if_none_match: Optional[str],
+    read: Callable[[Any], Dict[str, Any]],
+    encode: Callable[[Dict[str, Any]], Response],
+) -> Response:
+    """Serve read(req) through encode, short-circuiting unchanged files."""
+    etag = _read_etag(req)
+    if etag is None:
+        return encode(read(req))
+    if _etag_matches(etag, if_none_match):
+        return Response(status_code=304, headers={"ETag": etag})
+    key = (read.__name__, etag)
+    with _read_cache_lock:
+        data = _read_cache.get(key)
+        if data is not None:
+            _read_cache.move_to_end(key)
+    if data is None:
+        data = read(req)
+        # Only trust the tag if the file didn't change underneath the read.
+        if _read_etag(req) != etag:
+            return encode(data)
+        with _read_cache_lock:
+            _read_cache[key] = data
+            while len(_read_cache) > READ_CACHE_SIZE:
+                _read_cache.popitem(last=False)
+    response = encode(data)
+    response.headers["ETag"] = etag
+    return response
+
+
+_ensured_dirs: Set[str] = set()
+
+
+async def ensure_dir(path: str) -> None:
+    """Create the parent directory of path, at most once per directory."""
+    d = os.path.dirname(os.path.abspath(path))
+    if d in _ensured_dirs:
+        return
+    await anyio.to_thread.run_sync(partial(os.makedirs, d, exist_ok=True))
+    _ensured_dirs.add(d)
+
+
+def _edit_document(req: BaseModel, load: Callable[[str], Any], apply: Callable[[Any, Any], str]) -> Response:
+    """Load a cached document, apply one edit and save it, under the file lock."""
+    _check_commit_mode(req)
+    with locked_document(req.file_path):
+        obj = load(req.file_path)
+        message = apply(obj, req)
+        _commit(obj, req)
+    return ok(message)
+
+
+def _run_batch(
+    req: BaseModel,
+    load: Callable[[str], Any],
+    new: Callable[[], Any],
+    ops: Dict[str, Tuple[type, Callable[[Any, Any], str]]],
+) -> Response:
+    """Apply an ordered list of edits to one in-memory document and save once.
+
+    Nothing is written if any operation fails.
+    """
+    _check_commit_mode(req)
+    checked = []
+    for i, op in enumerate(req.ops):
+        model, apply = ops[op.op]
+        try:
+            checked.append((apply, model.model_validate({**op.args, "file_path": req.file_path})))
+        except ValidationError as e:
+            raise RequestError(f"Operation {i} ({op.op}): {e}")
+    with locked_document(req.file_path):
+        if req.create_if_missing and not os.path.exists(req.file_path) and not has_pending_edits(req.file_path):
+            obj = new()
+        else:
+            obj = load(req.file_path)
+        results = []
+        for i, (apply, args) in enumerate(checked):
+            try:
+                results.append(apply(obj, args))
+            except RequestError as e:
+                message = f"Operation {i} ({req.ops[i].op}): {e}"
+                if i:
+                    # Earlier operations already changed the object.
+                    if has_pending_edits(req.file_path):
+                        message += "; pending commit=false edits to the file were discarded"
+                    evict_cached(req.file_path)
+                raise RequestError(message)
+        _commit(obj, req)
+    return ok(f"Applied {len(results)} operation(s) to {req.file_path}", {"results": results})
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -251,69 +981,123 @@ class AddPptxShapeRequest(BaseModel):
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 
-@app.post("/word/create", response_model=ApiResponse, tags=["Word"])
-async def word_create(req: CreateWordRequest):
-    """Create a new Word document with optional title and paragraphs."""
-    from docx import Document
-
-    try:
+def _word_create_sync(req: CreateWordRequest) -> Response:
+    with locked_document(req.file_path):
         doc = Document()
         if req.title:
             doc.add_heading(req.title, level=1)
         for para in req.paragraphs:
             doc.add_paragraph(para)
-        Path(req.file_path).parent.mkdir(parents=True, exist_ok=True)
-        doc.save(req.file_path)
-        return ApiResponse(message=f"Created {req.file_path}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        save_cached(doc, req.file_path)
+    return ok(f"Created {req.file_path}")
 
 
-@app.post("/word/add_content", response_model=ApiResponse, tags=["Word"])
-async def word_add_content(req: AddWordContentRequest):
-    """Add paragraphs and/or headings to an existing Word document."""
-    from docx import Document
+@app.post("/word/create", response_model=ApiResponse, tags=["Word"], dependencies=_NEEDS_DOCX)
+async def word_create(req: CreateWordRequest):
+    """Create a new Word document with optional title and paragraphs."""
+    await ensure_dir(req.file_path)
+    return await _offload(_word_create_sync, req)
 
-    try:
-        doc = Document(req.file_path)
-        if req.headings:
-            for h in req.headings:
-                doc.add_heading(h.get("text", ""), level=h.get("level", 1))
-        for para in req.paragraphs:
-            doc.add_paragraph(para)
-        doc.save(req.file_path)
-        return ApiResponse(message=f"Content added to {req.file_path}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+def _word_add_content(doc: Any, req: AddWordContentRequest) -> str:
+    if req.headings:
+        for h in req.headings:
+            doc.add_heading(h.get("text", ""), level=h.get("level", 1))
+    for para in req.paragraphs:
+        doc.add_paragraph(para)
+    return f"Content added to {req.file_path}"
 
 
-@app.post("/word/search_replace", response_model=ApiResponse, tags=["Word"])
-async def word_search_replace(req: SearchReplaceWordRequest):
+@app.post("/word/add_content", response_model=ApiResponse, tags=["Word"], dependencies=_NEEDS_DOCX)
+def word_add_content(req: AddWordContentRequest):
+    """Add paragraphs and/or headings to an existing Word document."""
+    return _edit_document(req, load_docx, _word_add_content)
+
+
+def _word_add_paragraph(doc: Any, args: WordParagraphArgs) -> str:
+    doc.add_paragraph(args.text)
+    return "Paragraph added"
+
+
+def _word_add_heading(doc: Any, args: WordHeadingArgs) -> str:
+    doc.add_heading(args.text, level=args.level)
+    return "Heading added"
+
+
+def _word_search_replace(doc: Any, req: SearchReplaceWordRequest) -> str:
+    search = req.search
+    replace = req.replace
+    count = 0
+    if not search:
+        return "Replaced 0 occurrence(s)"
+    # Paragraph.text costs an XPath query per run; gather the text of every
+    # paragraph in one query and only look at runs where there is a match.
+    para_texts: Dict[Any, List[str]] = {}
+    for el in _BODY_PARAGRAPH_TEXT(doc.element.body):
+        owner = el.getparent().getparent()
+        p = owner if owner.tag == _W_P else owner.getparent()
+        para_texts.setdefault(p, []).append(str(el))
+    for para in doc.paragraphs:
+        parts = para_texts.get(para._p)
+        if parts is None or search not in "".join(parts):
+            continue
+        count += _replace_in_runs(_PARAGRAPH_RUN_TEXT(para._p), search, replace)
+    return f"Replaced {count} occurrence(s)"
+
+
+def _replace_in_runs(nodes: List[Any], search: str, replace: str) -> int:
+    """Replace search in the text of consecutive <w:t> nodes; returns the count.
+
+    Only the nodes a match overlaps change: the first keeps its text before
+    the match plus the replacement, nodes inside the match are emptied and
+    the last keeps its text after the match. Each run keeps its formatting
+    and non-text content (pictures, fields, breaks) is never touched.
+    """
+    values = [t.text or "" for t in nodes]
+    offsets = []
+    total = 0
+    for value in values:
+        offsets.append(total)
+        total += len(value)
+    joined = "".join(values)
+    matches = []
+    start = joined.find(search)
+    while start != -1:
+        matches.append(start)
+        start = joined.find(search, start + len(search))
+    # Right to left, so the offsets of earlier matches stay valid.
+    for start in reversed(matches):
+        end = start + len(search)
+        first = bisect_right(offsets, start) - 1
+        last = bisect_right(offsets, end - 1) - 1
+        head = values[first][:start - offsets[first]] + replace
+        if first == last:
+            values[first] = head + values[first][end - offsets[first]:]
+        else:
+            values[first] = head
+            for k in range(first + 1, last):
+                values[k] = ""
+            values[last] = values[last][end - offsets[last]:]
+    if matches:
+        for t, value in zip(nodes, values):
+            if (t.text or "") != value:
+                t.text = value
+                if value != value.strip():
+                    t.set(_XML_SPACE, "preserve")
+    return len(matches)
+
+
+@app.post("/word/search_replace", response_model=ApiResponse, tags=["Word"], dependencies=_NEEDS_DOCX)
+def word_search_replace(req: SearchReplaceWordRequest):
     """Find and replace text in a Word document."""
-    from docx import Document
+    return _edit_document(req, load_docx, _word_search_replace)
 
-    try:
-        doc = Document(req.file_path)
-        count = 0
-        for para in doc.paragraphs:
-            if req.search in para.text:
-                for run in para.runs:
-                    if req.search in run.text:
-                        run.text = run.text.replace(req.search, req.replace)
-                        count += 1
-        doc.save(req.file_path)
-        return ApiResponse(message=f"Replaced {count} occurrence(s)")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/word/read", response_model=ApiResponse, tags=["Word"])
-async def word_read(req: ReadWordRequest):
-    """Read all text from a Word document."""
-    from docx import Document
 
-    try:
-        doc = Document(req.file_path)
+def _word_read_data(req: ReadWordRequest) -> Dict[str, Any]:
+    # Take the text under the lock; encoding and sending happen after it is
+    # released, so a slow client can't hold up edits to the file.
+    with locked_document(req.file_path, read_only=True):
+        doc = load_docx(req.file_path)
         paragraphs = [p.text for p in doc.paragraphs]
         tables = []
         for table in doc.tables:
@@ -321,168 +1105,171 @@ async def word_read(req: ReadWordRequest):
             for row in table.rows:
                 table_data.append([cell.text for cell in row.cells])
             tables.append(table_data)
-        return ApiResponse(
-            message="OK",
-            data={"paragraphs": paragraphs, "tables": tables},
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {"paragraphs": paragraphs, "tables": tables}
 
 
-@app.post("/word/add_table", response_model=ApiResponse, tags=["Word"])
-async def word_add_table(req: AddWordTableRequest):
-    """Add a table to a Word document."""
-    from docx import Document
+@app.post("/word/read", response_model=ApiResponse, tags=["Word"], dependencies=_NEEDS_DOCX)
+def word_read(req: ReadWordRequest, request: Request):
+    """Read all text from a Word document."""
+    return _conditional_read(req, request.headers.get("if-none-match"), _word_read_data, stream_ok)
+
+
+def _word_add_table(doc: Any, req: AddWordTableRequest) -> str:
+    num_cols = len(req.headers) if req.headers else (len(req.rows[0]) if req.rows else 1)
+    num_rows = (1 if req.headers else 0) + len(req.rows)
+    table = doc.add_table(rows=num_rows, cols=num_cols)
+    if req.style:
+        table.style = req.style
+    # Fill the freshly generated cells in place. table.cell() rebuilds the
+    # cell grid on every call, and _Cell.text clears and recreates the cell.
+    values = [req.headers, *req.rows] if req.headers else req.rows
+    for tr, row_data in zip(table._tbl.tr_lst, values):
+        for tc, val in zip(tr.tc_lst, row_data):
+            text = "" if val is None else str(val)
+            if not text:
+                continue
+            p = tc.p_lst[0]
+            if _NEEDS_TEXT_SETTER(text):
+                p.add_r().text = text
+                continue
+            t = SubElement(SubElement(p, _W_R), _W_T)
+            t.text = text
+            if text[0].isspace() or text[-1].isspace():
+                t.set(_XML_SPACE, "preserve")
+    return f"Table added ({num_rows}x{num_cols})"
 
-    try:
-        doc = Document(req.file_path)
-        num_cols = len(req.headers) if req.headers else (len(req.rows[0]) if req.rows else 1)
-        num_rows = (1 if req.headers else 0) + len(req.rows)
-        table = doc.add_table(rows=num_rows, cols=num_cols)
-        if req.style:
-            table.style = req.style
-        row_offset = 0
-        if req.headers:
-            for j, h in enumerate(req.headers):
-                table.cell(0, j).text = h
-            row_offset = 1
-        for i, row_data in enumerate(req.rows):
-            for j, val in enumerate(row_data):
-                if j < num_cols:
-                    table.cell(i + row_offset, j).text = str(val)
-        doc.save(req.file_path)
-        return ApiResponse(message=f"Table added ({num_rows}x{num_cols})")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/word/format_text", response_model=ApiResponse, tags=["Word"])
-async def word_format_text(req: FormatWordTextRequest):
+
+@app.post("/word/add_table", response_model=ApiResponse, tags=["Word"], dependencies=_NEEDS_DOCX)
+def word_add_table(req: AddWordTableRequest):
+    """Add a table to a Word document."""
+    return _edit_document(req, load_docx, _word_add_table)
+
+
+def _word_format_text(doc: Any, req: FormatWordTextRequest) -> str:
+    if req.paragraph_index >= len(doc.paragraphs):
+        raise RequestError(f"Paragraph index {req.paragraph_index} out of range")
+    para = doc.paragraphs[req.paragraph_index]
+    for run in para.runs:
+        if req.bold is not None:
+            run.font.bold = req.bold
+        if req.italic is not None:
+            run.font.italic = req.italic
+        if req.underline is not None:
+            run.font.underline = req.underline
+        if req.font_size is not None:
+            run.font.size = Pt(req.font_size)
+        if req.font_name is not None:
+            run.font.name = req.font_name
+        if req.color is not None:
+            run.font.color.rgb = DocxRGBColor.from_string(req.color.lstrip("#"))
+        if req.hidden is not None:
+            run.font.hidden = req.hidden
+    return f"Formatted paragraph {req.paragraph_index}"
+
+
+@app.post("/word/format_text", response_model=ApiResponse, tags=["Word"], dependencies=_NEEDS_DOCX)
+def word_format_text(req: FormatWordTextRequest):
     """Format text in a specific paragraph (bold, italic, color, font, hidden)."""
-    from docx import Document
-    from docx.shared import Pt, RGBColor
+    return _edit_document(req, load_docx, _word_format_text)
 
-    try:
-        doc = Document(req.file_path)
-        if req.paragraph_index >= len(doc.paragraphs):
-            raise HTTPException(status_code=400, detail=f"Paragraph index {req.paragraph_index} out of range")
-        para = doc.paragraphs[req.paragraph_index]
-        for run in para.runs:
-            if req.bold is not None:
-                run.font.bold = req.bold
-            if req.italic is not None:
-                run.font.italic = req.italic
-            if req.underline is not None:
-                run.font.underline = req.underline
-            if req.font_size is not None:
-                run.font.size = Pt(req.font_size)
-            if req.font_name is not None:
-                run.font.name = req.font_name
-            if req.color is not None:
-                run.font.color.rgb = RGBColor.from_string(req.color.lstrip("#"))
-            if req.hidden is not None:
-                run.font.hidden = req.hidden
-        doc.save(req.file_path)
-        return ApiResponse(message=f"Formatted paragraph {req.paragraph_index}")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
+def _word_add_hyperlink(doc: Any, req: AddWordHyperlinkRequest) -> str:
+    para = doc.add_paragraph()
+
+    # Create hyperlink element
+    part = doc.part
+    r_id = part.relate_to(req.url, _HYPERLINK_REL, is_external=True)
+    hyperlink = SubElement(para._p, _W_HYPERLINK, {_R_ID: r_id})
+    run = SubElement(hyperlink, _W_R)
+    rPr = SubElement(run, _W_RPR)
+    SubElement(rPr, _W_RSTYLE, {_W_VAL: "Hyperlink"})
+    SubElement(run, _W_T).text = req.text
+    return f"Hyperlink added: {req.text}"
 
-@app.post("/word/add_hyperlink", response_model=ApiResponse, tags=["Word"])
-async def word_add_hyperlink(req: AddWordHyperlinkRequest):
+
+@app.post("/word/add_hyperlink", response_model=ApiResponse, tags=["Word"], dependencies=_NEEDS_DOCX)
+def word_add_hyperlink(req: AddWordHyperlinkRequest):
     """Add a paragraph with a hyperlink to a Word document."""
-    from docx import Document
-    from docx.oxml.ns import qn
-    from docx.oxml import OxmlElement
+    return _edit_document(req, load_docx, _word_add_hyperlink)
 
-    try:
-        doc = Document(req.file_path)
-        para = doc.add_paragraph()
-
-        # Create hyperlink element
-        part = doc.part
-        r_id = part.relate_to(req.url, "http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink", is_external=True)
-        hyperlink = OxmlElement("w:hyperlink")
-        hyperlink.set(qn("r:id"), r_id)
-        run = OxmlElement("w:r")
-        rPr = OxmlElement("w:rPr")
-        rStyle = OxmlElement("w:rStyle")
-        rStyle.set(qn("w:val"), "Hyperlink")
-        rPr.append(rStyle)
-        run.append(rPr)
-        text_elem = OxmlElement("w:t")
-        text_elem.text = req.text
-        run.append(text_elem)
-        hyperlink.append(run)
-        para._p.append(hyperlink)
-
-        doc.save(req.file_path)
-        return ApiResponse(message=f"Hyperlink added: {req.text}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/word/delete_paragraph", response_model=ApiResponse, tags=["Word"])
-async def word_delete_paragraph(req: DeleteWordParagraphRequest):
+
+def _word_delete_paragraph(doc: Any, req: DeleteWordParagraphRequest) -> str:
+    if req.paragraph_index >= len(doc.paragraphs):
+        raise RequestError(f"Paragraph index {req.paragraph_index} out of range")
+    p = doc.paragraphs[req.paragraph_index]._p
+    p.getparent().remove(p)
+    return f"Deleted paragraph {req.paragraph_index}"
+
+
+@app.post("/word/delete_paragraph", response_model=ApiResponse, tags=["Word"], dependencies=_NEEDS_DOCX)
+def word_delete_paragraph(req: DeleteWordParagraphRequest):
     """Delete a paragraph by index from a Word document."""
-    from docx import Document
+    return _edit_document(req, load_docx, _word_delete_paragraph)
 
-    try:
-        doc = Document(req.file_path)
-        if req.paragraph_index >= len(doc.paragraphs):
-            raise HTTPException(status_code=400, detail=f"Paragraph index {req.paragraph_index} out of range")
-        p = doc.paragraphs[req.paragraph_index]._p
-        p.getparent().remove(p)
-        doc.save(req.file_path)
-        return ApiResponse(message=f"Deleted paragraph {req.paragraph_index}")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+def _word_add_page_break(doc: Any, req: WordPageBreakRequest) -> str:
+    doc.add_page_break()
+    return "Page break added"
 
 
-@app.post("/word/add_page_break", response_model=ApiResponse, tags=["Word"])
-async def word_add_page_break(req: WordPageBreakRequest):
+@app.post("/word/add_page_break", response_model=ApiResponse, tags=["Word"], dependencies=_NEEDS_DOCX)
+def word_add_page_break(req: WordPageBreakRequest):
     """Add a page break to a Word document."""
-    from docx import Document
+    return _edit_document(req, load_docx, _word_add_page_break)
 
-    try:
-        doc = Document(req.file_path)
-        doc.add_page_break()
-        doc.save(req.file_path)
-        return ApiResponse(message="Page break added")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+def _word_header_footer(doc: Any, req: AddWordHeaderFooterRequest) -> str:
+    section = doc.sections[0]
+    if req.header_text is not None:
+        header = section.header
+        header.is_linked_to_previous = False
+        if header.paragraphs:
+            header.paragraphs[0].text = req.header_text
+        else:
+            header.add_paragraph(req.header_text)
+    if req.footer_text is not None:
+        footer = section.footer
+        footer.is_linked_to_previous = False
+        if footer.paragraphs:
+            footer.paragraphs[0].text = req.footer_text
+        else:
+            footer.add_paragraph(req.footer_text)
+    return "Header/footer updated"
 
 
-@app.post("/word/header_footer", response_model=ApiResponse, tags=["Word"])
-async def word_header_footer(req: AddWordHeaderFooterRequest):
+@app.post("/word/header_footer", response_model=ApiResponse, tags=["Word"], dependencies=_NEEDS_DOCX)
+def word_header_footer(req: AddWordHeaderFooterRequest):
     """Set header and/or footer text in a Word document."""
-    from docx import Document
+    return _edit_document(req, load_docx, _word_header_footer)
 
-    try:
-        doc = Document(req.file_path)
-        section = doc.sections[0]
-        if req.header_text is not None:
-            header = section.header
-            header.is_linked_to_previous = False
-            if header.paragraphs:
-                header.paragraphs[0].text = req.header_text
-            else:
-                header.add_paragraph(req.header_text)
-        if req.footer_text is not None:
-            footer = section.footer
-            footer.is_linked_to_previous = False
-            if footer.paragraphs:
-                footer.paragraphs[0].text = req.footer_text
-            else:
-                footer.add_paragraph(req.footer_text)
-        doc.save(req.file_path)
-        return ApiResponse(message="Header/footer updated")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+_WORD_BATCH_OPS: Dict[str, Tuple[type, Callable[[Any, Any], str]]] = {
+    "add_paragraph": (WordParagraphArgs, _word_add_paragraph),
+    "add_heading": (WordHeadingArgs, _word_add_heading),
+    "add_table": (AddWordTableRequest, _word_add_table),
+    "format": (FormatWordTextRequest, _word_format_text),
+    "hyperlink": (AddWordHyperlinkRequest, _word_add_hyperlink),
+    "page_break": (WordPageBreakRequest, _word_add_page_break),
+    "header_footer": (AddWordHeaderFooterRequest, _word_header_footer),
+    "search_replace": (SearchReplaceWordRequest, _word_search_replace),
+    "delete_paragraph": (DeleteWordParagraphRequest, _word_delete_paragraph),
+}
+
+
+def _new_docx() -> Any:
+    return Document()
+
+
+def _word_batch_sync(req: WordBatchRequest) -> Response:
+    return _run_batch(req, load_docx, _new_docx, _WORD_BATCH_OPS)
+
+
+@app.post("/word/batch", response_model=ApiResponse, tags=["Word"], dependencies=_NEEDS_DOCX)
+async def word_batch(req: WordBatchRequest):
+    """Apply several edits to a Word document with a single load and save."""
+    if req.create_if_missing:
+        await ensure_dir(req.file_path)
+    return await _offload(_word_batch_sync, req)
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -490,237 +1277,252 @@ async def word_header_footer(req: AddWordHeaderFooterRequest):
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 
-@app.post("/excel/create", response_model=ApiResponse, tags=["Excel"])
-async def excel_create(req: CreateExcelRequest):
-    """Create a new Excel workbook with one or more sheets."""
-    from openpyxl import Workbook
-
-    try:
-        wb = Workbook()
-        default_sheet = wb.active
-        for i, sheet_data in enumerate(req.sheets):
-            if i == 0:
-                ws = default_sheet
-                ws.title = sheet_data.name
-            else:
-                ws = wb.create_sheet(title=sheet_data.name)
-            for col, header in enumerate(sheet_data.headers, 1):
-                ws.cell(row=1, column=col, value=header)
-            for row_idx, row in enumerate(sheet_data.rows, 2):
-                for col_idx, value in enumerate(row, 1):
-                    ws.cell(row=row_idx, column=col_idx, value=value)
+def _excel_create_sync(req: CreateExcelRequest) -> Response:
+    with locked_document(req.file_path):
+        # Nothing to preserve in a new workbook, so stream rows out in
+        # write-only mode instead of materialising every Cell.
+        wb = Workbook(write_only=True)
+        for sheet_data in req.sheets:
+            ws = wb.create_sheet(title=sheet_data.name)
+            # Always emit the header row (even if empty) so data starts on row 2.
+            ws.append(sheet_data.headers)
+            for row in sheet_data.rows:
+                ws.append(row)
             if sheet_data.hidden:
                 ws.sheet_state = "hidden"
-        Path(req.file_path).parent.mkdir(parents=True, exist_ok=True)
-        wb.save(req.file_path)
-        return ApiResponse(message=f"Created {req.file_path}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        # A write-only workbook can't be reopened for editing, so it is
+        # not cached; the next edit parses the file from disk.
+        _atomic_save(wb, req.file_path)
+        evict_cached(req.file_path)
+    return ok(f"Created {req.file_path}")
 
 
-@app.post("/excel/write_data", response_model=ApiResponse, tags=["Excel"])
-async def excel_write_data(req: WriteExcelDataRequest):
-    """Write data to a sheet in an existing workbook (creates sheet if needed)."""
-    from openpyxl import load_workbook
+@app.post("/excel/create", response_model=ApiResponse, tags=["Excel"], dependencies=_NEEDS_OPENPYXL)
+async def excel_create(req: CreateExcelRequest):
+    """Create a new Excel workbook with one or more sheets."""
+    await ensure_dir(req.file_path)
+    return await _offload(_excel_create_sync, req)
 
-    try:
-        wb = load_workbook(req.file_path)
-        if req.sheet_name in wb.sheetnames:
-            ws = wb[req.sheet_name]
-        else:
-            ws = wb.create_sheet(title=req.sheet_name)
+
+def _excel_write_data(wb: Any, req: WriteExcelDataRequest) -> str:
+    ws = wb[req.sheet_name] if req.sheet_name in wb.sheetnames else wb.create_sheet(title=req.sheet_name)
+    # ws._cells is empty for new sheets and sheets that were never written;
+    # reading a cell to check would create it and shift append() down a row.
+    if ws._cells:
+        # Overwrite in place from A1, leaving cells outside the block alone.
+        # append() can't do this: it always writes below the last used row.
         for col, header in enumerate(req.headers, 1):
             ws.cell(row=1, column=col, value=header)
         for row_idx, row in enumerate(req.rows, 2):
             for col_idx, value in enumerate(row, 1):
                 ws.cell(row=row_idx, column=col_idx, value=value)
-        if req.hidden:
-            ws.sheet_state = "hidden"
-        wb.save(req.file_path)
-        return ApiResponse(message=f"Data written to {req.sheet_name} in {req.file_path}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    else:
+        ws.append(req.headers)
+        for row in req.rows:
+            ws.append(row)
+    if req.hidden:
+        ws.sheet_state = "hidden"
+    return f"Data written to {req.sheet_name} in {req.file_path}"
 
 
-@app.post("/excel/read", response_model=ApiResponse, tags=["Excel"])
-async def excel_read(req: ReadExcelRequest):
+@app.post("/excel/write_data", response_model=ApiResponse, tags=["Excel"], dependencies=_NEEDS_OPENPYXL)
+def excel_write_data(req: WriteExcelDataRequest):
+    """Write data to a sheet in an existing workbook (creates sheet if needed)."""
+    return _edit_document(req, load_xlsx, _excel_write_data)
+
+
+def _coerce_row(row: Tuple[Any, ...]) -> List[str]:
+    """Cell values as strings, empty cells as ""."""
+    # Strings are the common case, so test for them first.
+    return [cell if type(cell) is str else "" if cell is None else str(cell) for cell in row]
+
+
+def _read_sheet(ws: Any) -> Dict[str, Any]:
+    rows = [_coerce_row(row) for row in ws.iter_rows(values_only=True)]
+    # Sheets saved without a <dimension> element come back ragged in
+    # read-only mode; pad so every row has the same width.
+    width = max(map(len, rows), default=0)
+    for row in rows:
+        if len(row) < width:
+            row.extend([""] * (width - len(row)))
+    return {"rows": rows, "hidden": ws.sheet_state == "hidden"}
+
+
+def _excel_read_data(req: ReadExcelRequest) -> Dict[str, Any]:
+    # Read-only mode keeps the file open for the whole read. Hold the lock
+    # meanwhile: on Windows, an edit's os.replace over an open file fails.
+    with locked_document(req.file_path, read_only=True):
+        # Values only: read-only mode streams rows without building Cell or
+        # style objects for the whole sheet.
+        wb = load_workbook(req.file_path, data_only=True, read_only=True, keep_links=False)
+        # Sheets are read one after another on this handle. Row parsing holds
+        # the GIL, so per-sheet threads don't overlap; a handle per sheet would
+        # also re-parse the shared strings table and stylesheet for every sheet.
+        try:
+            sheets_to_read = [req.sheet_name] if req.sheet_name else wb.sheetnames
+            result = {name: _read_sheet(wb[name]) for name in sheets_to_read if name in wb.sheetnames}
+        finally:
+            wb.close()
+    return {"sheets": result}
+
+
+@app.post("/excel/read", response_model=ApiResponse, tags=["Excel"], dependencies=_NEEDS_OPENPYXL)
+def excel_read(req: ReadExcelRequest, request: Request):
     """Read data from an Excel workbook."""
-    from openpyxl import load_workbook
+    return _conditional_read(req, request.headers.get("if-none-match"), _excel_read_data, partial(ok, "OK"))
 
-    try:
-        wb = load_workbook(req.file_path, data_only=True)
-        result = {}
-        sheets_to_read = [req.sheet_name] if req.sheet_name else wb.sheetnames
-        for sheet_name in sheets_to_read:
-            if sheet_name not in wb.sheetnames:
-                continue
-            ws = wb[sheet_name]
-            rows = []
-            for row in ws.iter_rows(values_only=True):
-                rows.append([str(cell) if cell is not None else "" for cell in row])
-            result[sheet_name] = {"rows": rows, "hidden": ws.sheet_state == "hidden"}
-        return ApiResponse(message="OK", data={"sheets": result})
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/excel/apply_formula", response_model=ApiResponse, tags=["Excel"])
-async def excel_apply_formula(req: ApplyFormulaRequest):
-    """Write a formula to a cell (e.g. =SUM(A1:A10))."""
-    from openpyxl import load_workbook
 
-    try:
-        wb = load_workbook(req.file_path)
-        if req.sheet_name not in wb.sheetnames:
-            raise HTTPException(status_code=400, detail=f"Sheet '{req.sheet_name}' not found")
-        ws = wb[req.sheet_name]
-        ws[req.cell] = req.formula
-        wb.save(req.file_path)
-        return ApiResponse(message=f"Formula set in {req.cell}: {req.formula}")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+def _get_sheet(wb: Any, sheet_name: str) -> Any:
+    if sheet_name not in wb.sheetnames:
+        raise RequestError(f"Sheet '{sheet_name}' not found")
+    return wb[sheet_name]
+
+
+def _excel_apply_formula(wb: Any, req: ApplyFormulaRequest) -> str:
+    ws = _get_sheet(wb, req.sheet_name)
+    ws[req.cell] = req.formula
+    return f"Formula set in {req.cell}: {req.formula}"
 
 
-@app.post("/excel/format_range", response_model=ApiResponse, tags=["Excel"])
-async def excel_format_range(req: FormatRangeRequest):
+@app.post("/excel/apply_formula", response_model=ApiResponse, tags=["Excel"], dependencies=_NEEDS_OPENPYXL)
+def excel_apply_formula(req: ApplyFormulaRequest):
+    """Write a formula to a cell (e.g. =SUM(A1:A10))."""
+    return _edit_document(req, load_xlsx, _excel_apply_formula)
+
+
+def _excel_format_range(wb: Any, req: FormatRangeRequest) -> str:
+    ws = _get_sheet(wb, req.sheet_name)
+
+    cell_range = req.start_cell if not req.end_cell else f"{req.start_cell}:{req.end_cell}"
+    min_col, min_row, max_col, max_row = range_boundaries(cell_range)
+
+    # Style objects are immutable; build them once and share across cells.
+    font = None
+    if req.bold is not None or req.italic is not None or req.font_size or req.font_color:
+        font_kwargs: Dict[str, Any] = {}
+        if req.bold is not None:
+            font_kwargs["bold"] = req.bold
+        if req.italic is not None:
+            font_kwargs["italic"] = req.italic
+        if req.font_size:
+            font_kwargs["size"] = req.font_size
+        if req.font_color:
+            font_kwargs["color"] = req.font_color.lstrip("#")
+        font = Font(**font_kwargs)
+    fill = None
+    if req.fill_color:
+        fill_color = req.fill_color.lstrip("#")
+        fill = PatternFill(start_color=fill_color, end_color=fill_color, fill_type="solid")
+
+    # iter_rows also covers a single cell, where ws["A1"] returns a bare Cell.
+    for row in ws.iter_rows(min_row=min_row, max_row=max_row, min_col=min_col, max_col=max_col):
+        for cell in row:
+            if font is not None:
+                cell.font = font
+            if fill is not None:
+                cell.fill = fill
+            if req.number_format:
+                cell.number_format = req.number_format
+
+    # Hide rows if requested
+    if req.hidden:
+        for r in range(min_row, max_row + 1):
+            ws.row_dimensions[r].hidden = True
+
+    return f"Formatted range {cell_range}"
+
+
+@app.post("/excel/format_range", response_model=ApiResponse, tags=["Excel"], dependencies=_NEEDS_OPENPYXL)
+def excel_format_range(req: FormatRangeRequest):
     """Format cells: font, fill color, number format, hide rows."""
-    from openpyxl import load_workbook
-    from openpyxl.styles import Font, PatternFill
+    return _edit_document(req, load_xlsx, _excel_format_range)
 
-    try:
-        wb = load_workbook(req.file_path)
-        if req.sheet_name not in wb.sheetnames:
-            raise HTTPException(status_code=400, detail=f"Sheet '{req.sheet_name}' not found")
-        ws = wb[req.sheet_name]
-
-        cell_range = req.start_cell if not req.end_cell else f"{req.start_cell}:{req.end_cell}"
-        for row in ws[cell_range]:
-            cells = row if isinstance(row, tuple) else (row,)
-            for cell in cells:
-                if req.bold is not None or req.italic is not None or req.font_size or req.font_color:
-                    font_kwargs: Dict[str, Any] = {}
-                    if req.bold is not None:
-                        font_kwargs["bold"] = req.bold
-                    if req.italic is not None:
-                        font_kwargs["italic"] = req.italic
-                    if req.font_size:
-                        font_kwargs["size"] = req.font_size
-                    if req.font_color:
-                        font_kwargs["color"] = req.font_color.lstrip("#")
-                    cell.font = Font(**font_kwargs)
-                if req.fill_color:
-                    cell.fill = PatternFill(start_color=req.fill_color.lstrip("#"), end_color=req.fill_color.lstrip("#"), fill_type="solid")
-                if req.number_format:
-                    cell.number_format = req.number_format
-
-        # Hide rows if requested
-        if req.hidden:
-            from openpyxl.utils import range_boundaries
-            min_col, min_row, max_col, max_row = range_boundaries(cell_range)
-            for r in range(min_row, max_row + 1):
-                ws.row_dimensions[r].hidden = True
-
-        wb.save(req.file_path)
-        return ApiResponse(message=f"Formatted range {cell_range}")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
+def _excel_merge_cells(wb: Any, req: MergeCellsRequest) -> str:
+    ws = _get_sheet(wb, req.sheet_name)
+    ws.merge_cells(f"{req.start_cell}:{req.end_cell}")
+    return f"Merged {req.start_cell}:{req.end_cell}"
 
-@app.post("/excel/merge_cells", response_model=ApiResponse, tags=["Excel"])
-async def excel_merge_cells(req: MergeCellsRequest):
+
+@app.post("/excel/merge_cells", response_model=ApiResponse, tags=["Excel"], dependencies=_NEEDS_OPENPYXL)
+def excel_merge_cells(req: MergeCellsRequest):
     """Merge a range of cells."""
-    from openpyxl import load_workbook
+    return _edit_document(req, load_xlsx, _excel_merge_cells)
 
-    try:
-        wb = load_workbook(req.file_path)
-        if req.sheet_name not in wb.sheetnames:
-            raise HTTPException(status_code=400, detail=f"Sheet '{req.sheet_name}' not found")
-        ws = wb[req.sheet_name]
-        ws.merge_cells(f"{req.start_cell}:{req.end_cell}")
-        wb.save(req.file_path)
-        return ApiResponse(message=f"Merged {req.start_cell}:{req.end_cell}")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+def _excel_delete_sheet(wb: Any, req: SheetOpRequest) -> str:
+    _get_sheet(wb, req.sheet_name)
+    del wb[req.sheet_name]
+    return f"Deleted sheet '{req.sheet_name}'"
 
 
-@app.post("/excel/delete_sheet", response_model=ApiResponse, tags=["Excel"])
-async def excel_delete_sheet(req: SheetOpRequest):
+@app.post("/excel/delete_sheet", response_model=ApiResponse, tags=["Excel"], dependencies=_NEEDS_OPENPYXL)
+def excel_delete_sheet(req: SheetOpRequest):
     """Delete a sheet from a workbook."""
-    from openpyxl import load_workbook
+    return _edit_document(req, load_xlsx, _excel_delete_sheet)
 
-    try:
-        wb = load_workbook(req.file_path)
-        if req.sheet_name not in wb.sheetnames:
-            raise HTTPException(status_code=400, detail=f"Sheet '{req.sheet_name}' not found")
-        del wb[req.sheet_name]
-        wb.save(req.file_path)
-        return ApiResponse(message=f"Deleted sheet '{req.sheet_name}'")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
+def _excel_rename_sheet(wb: Any, req: SheetOpRequest) -> str:
+    _get_sheet(wb, req.sheet_name).title = req.new_name
+    return f"Renamed '{req.sheet_name}' -> '{req.new_name}'"
 
-@app.post("/excel/rename_sheet", response_model=ApiResponse, tags=["Excel"])
-async def excel_rename_sheet(req: SheetOpRequest):
+
+@app.post("/excel/rename_sheet", response_model=ApiResponse, tags=["Excel"], dependencies=_NEEDS_OPENPYXL)
+def excel_rename_sheet(req: SheetOpRequest):
     """Rename a sheet in a workbook."""
-    from openpyxl import load_workbook
+    return _edit_document(req, load_xlsx, _excel_rename_sheet)
 
-    try:
-        wb = load_workbook(req.file_path)
-        if req.sheet_name not in wb.sheetnames:
-            raise HTTPException(status_code=400, detail=f"Sheet '{req.sheet_name}' not found")
-        wb[req.sheet_name].title = req.new_name
-        wb.save(req.file_path)
-        return ApiResponse(message=f"Renamed '{req.sheet_name}' -> '{req.new_name}'")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+def _excel_insert_rows(wb: Any, req: InsertRowsColsRequest) -> str:
+    ws = _get_sheet(wb, req.sheet_name)
+    ws.insert_rows(req.index, req.count)
+    return f"Inserted {req.count} row(s) at index {req.index}"
 
 
-@app.post("/excel/insert_rows", response_model=ApiResponse, tags=["Excel"])
-async def excel_insert_rows(req: InsertRowsColsRequest):
+@app.post("/excel/insert_rows", response_model=ApiResponse, tags=["Excel"], dependencies=_NEEDS_OPENPYXL)
+def excel_insert_rows(req: InsertRowsColsRequest):
     """Insert rows at a given index."""
-    from openpyxl import load_workbook
+    return _edit_document(req, load_xlsx, _excel_insert_rows)
 
-    try:
-        wb = load_workbook(req.file_path)
-        if req.sheet_name not in wb.sheetnames:
-            raise HTTPException(status_code=400, detail=f"Sheet '{req.sheet_name}' not found")
-        ws = wb[req.sheet_name]
-        ws.insert_rows(req.index, req.count)
-        wb.save(req.file_path)
-        return ApiResponse(message=f"Inserted {req.count} row(s) at index {req.index}")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
+def _excel_insert_cols(wb: Any, req: InsertRowsColsRequest) -> str:
+    ws = _get_sheet(wb, req.sheet_name)
+    ws.insert_cols(req.index, req.count)
+    return f"Inserted {req.count} column(s) at index {req.index}"
 
-@app.post("/excel/insert_cols", response_model=ApiResponse, tags=["Excel"])
-async def excel_insert_cols(req: InsertRowsColsRequest):
+
+@app.post("/excel/insert_cols", response_model=ApiResponse, tags=["Excel"], dependencies=_NEEDS_OPENPYXL)
+def excel_insert_cols(req: InsertRowsColsRequest):
     """Insert columns at a given index."""
-    from openpyxl import load_workbook
+    return _edit_document(req, load_xlsx, _excel_insert_cols)
 
-    try:
-        wb = load_workbook(req.file_path)
-        if req.sheet_name not in wb.sheetnames:
-            raise HTTPException(status_code=400, detail=f"Sheet '{req.sheet_name}' not found")
-        ws = wb[req.sheet_name]
-        ws.insert_cols(req.index, req.count)
-        wb.save(req.file_path)
-        return ApiResponse(message=f"Inserted {req.count} column(s) at index {req.index}")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+_EXCEL_BATCH_OPS: Dict[str, Tuple[type, Callable[[Any, Any], str]]] = {
+    "write_data": (WriteExcelDataRequest, _excel_write_data),
+    "apply_formula": (ApplyFormulaRequest, _excel_apply_formula),
+    "format_range": (FormatRangeRequest, _excel_format_range),
+    "merge_cells": (MergeCellsRequest, _excel_merge_cells),
+    "delete_sheet": (SheetOpRequest, _excel_delete_sheet),
+    "rename_sheet": (SheetOpRequest, _excel_rename_sheet),
+    "insert_rows": (InsertRowsColsRequest, _excel_insert_rows),
+    "insert_cols": (InsertRowsColsRequest, _excel_insert_cols),
+}
+
+
+def _new_xlsx() -> Any:
+    return Workbook()
+
+
+def _excel_batch_sync(req: ExcelBatchRequest) -> Response:
+    return _run_batch(req, load_xlsx, _new_xlsx, _EXCEL_BATCH_OPS)
+
+
+@app.post("/excel/batch", response_model=ApiResponse, tags=["Excel"], dependencies=_NEEDS_OPENPYXL)
+async def excel_batch(req: ExcelBatchRequest):
+    """Apply several edits to an Excel workbook with a single load and save."""
+    if req.create_if_missing:
+        await ensure_dir(req.file_path)
+    return await _offload(_excel_batch_sync, req)
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -728,12 +1530,8 @@ async def excel_insert_cols(req: InsertRowsColsRequest):
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
 
-@app.post("/pptx/create", response_model=ApiResponse, tags=["PowerPoint"])
-async def pptx_create(req: CreatePptxRequest):
-    """Create a new PowerPoint presentation with slides."""
-    from pptx import Presentation
-
-    try:
+def _pptx_create_sync(req: CreatePptxRequest) -> Response:
+    with locked_document(req.file_path):
         prs = Presentation()
         for slide_data in req.slides:
             layout = prs.slide_layouts[1]  # Title and Content
@@ -744,41 +1542,38 @@ async def pptx_create(req: CreatePptxRequest):
                 slide.placeholders[1].text = slide_data.content
             if slide_data.notes:
                 slide.notes_slide.notes_text_frame.text = slide_data.notes
-        Path(req.file_path).parent.mkdir(parents=True, exist_ok=True)
-        prs.save(req.file_path)
-        return ApiResponse(message=f"Created {req.file_path}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        save_cached(prs, req.file_path)
+    return ok(f"Created {req.file_path}")
+
+
+@app.post("/pptx/create", response_model=ApiResponse, tags=["PowerPoint"], dependencies=_NEEDS_PPTX)
+async def pptx_create(req: CreatePptxRequest):
+    """Create a new PowerPoint presentation with slides."""
+    await ensure_dir(req.file_path)
+    return await _offload(_pptx_create_sync, req)
+
+
+def _pptx_add_slide(prs: Any, req: AddSlideRequest) -> str:
+    layout = prs.slide_layouts[1]
+    slide = prs.slides.add_slide(layout)
+    if req.title:
+        slide.shapes.title.text = req.title
+    if req.content and len(slide.placeholders) > 1:
+        slide.placeholders[1].text = req.content
+    if req.notes:
+        slide.notes_slide.notes_text_frame.text = req.notes
+    return f"Slide added to {req.file_path}"
 
 
-@app.post("/pptx/add_slide", response_model=ApiResponse, tags=["PowerPoint"])
-async def pptx_add_slide(req: AddSlideRequest):
+@app.post("/pptx/add_slide", response_model=ApiResponse, tags=["PowerPoint"], dependencies=_NEEDS_PPTX)
+def pptx_add_slide(req: AddSlideRequest):
     """Add a slide to an existing PowerPoint presentation."""
-    from pptx import Presentation
+    return _edit_document(req, load_pptx, _pptx_add_slide)
 
-    try:
-        prs = Presentation(req.file_path)
-        layout = prs.slide_layouts[1]
-        slide = prs.slides.add_slide(layout)
-        if req.title:
-            slide.shapes.title.text = req.title
-        if req.content and len(slide.placeholders) > 1:
-            slide.placeholders[1].text = req.content
-        if req.notes:
-            slide.notes_slide.notes_text_frame.text = req.notes
-        prs.save(req.file_path)
-        return ApiResponse(message=f"Slide added to {req.file_path}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
-
-
-@app.post("/pptx/read", response_model=ApiResponse, tags=["PowerPoint"])
-async def pptx_read(req: ReadPptxRequest):
-    """Read all text and notes from a PowerPoint presentation."""
-    from pptx import Presentation
 
-    try:
-        prs = Presentation(req.file_path)
+def _pptx_read_data(req: ReadPptxRequest) -> Dict[str, Any]:
+    with locked_document(req.file_path, read_only=True):
+        prs = load_pptx(req.file_path)
         slides = []
         for i, slide in enumerate(prs.slides, 1):
             slide_text = []
@@ -790,150 +1585,171 @@ async def pptx_read(req: ReadPptxRequest):
                 notes = slide.notes_slide.notes_text_frame.text
             slides.append({
                 "slide_number": i,
-                "text": "\n".join(slide_text),
+                "text": "\n".join(slide_text) if req.joined else slide_text,
                 "notes": notes,
             })
-        return ApiResponse(message="OK", data={"slides": slides})
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    return {"slides": slides}
 
 
-@app.post("/pptx/add_table", response_model=ApiResponse, tags=["PowerPoint"])
-async def pptx_add_table(req: AddPptxTableRequest):
-    """Add a table to a specific slide."""
-    from pptx import Presentation
-    from pptx.util import Inches
+@app.post("/pptx/read", response_model=ApiResponse, tags=["PowerPoint"], dependencies=_NEEDS_PPTX)
+def pptx_read(req: ReadPptxRequest, request: Request):
+    """Read all text and notes from a PowerPoint presentation."""
+    return _conditional_read(req, request.headers.get("if-none-match"), _pptx_read_data, stream_ok)
+
 
+def _get_slide(prs: Any, index: int) -> Any:
+    # Negative indices would count from the end; the API doesn't allow them.
+    if index < 0:
+        raise RequestError(f"Slide index {index} out of range")
     try:
-        prs = Presentation(req.file_path)
-        if req.slide_index < 0 or req.slide_index >= len(prs.slides):
-            raise HTTPException(status_code=400, detail=f"Slide index {req.slide_index} out of range")
-        slide = prs.slides[req.slide_index]
-        num_cols = len(req.headers) if req.headers else (len(req.rows[0]) if req.rows else 1)
-        num_rows = (1 if req.headers else 0) + len(req.rows)
-        table_shape = slide.shapes.add_table(
-            num_rows, num_cols,
-            Inches(req.left), Inches(req.top),
-            Inches(req.width), Inches(req.height),
-        )
-        table = table_shape.table
-        row_offset = 0
-        if req.headers:
-            for j, h in enumerate(req.headers):
-                table.cell(0, j).text = h
-            row_offset = 1
-        for i, row_data in enumerate(req.rows):
-            for j, val in enumerate(row_data):
-                if j < num_cols:
-                    table.cell(i + row_offset, j).text = str(val)
-        prs.save(req.file_path)
-        return ApiResponse(message=f"Table added to slide {req.slide_index}")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        return prs.slides[index]
+    except IndexError:
+        raise RequestError(f"Slide index {index} out of range") from None
+
+
+def _pptx_add_table(prs: Any, req: AddPptxTableRequest) -> str:
+    slide = _get_slide(prs, req.slide_index)
+    num_cols = len(req.headers) if req.headers else (len(req.rows[0]) if req.rows else 1)
+    num_rows = (1 if req.headers else 0) + len(req.rows)
+    left, top, width, height = (int(v * _EMU_PER_INCH) for v in (req.left, req.top, req.width, req.height))
+    table_shape = slide.shapes.add_table(num_rows, num_cols, left, top, width, height)
+    table = table_shape.table
+    # Each generated cell holds an empty <a:p>; append the run straight to it
+    # rather than going through table.cell(i, j).text.
+    values = [req.headers, *req.rows] if req.headers else req.rows
+    for i, (tr, row_data) in enumerate(zip(table._tbl.tr_lst, values)):
+        for j, (tc, val) in enumerate(zip(tr.tc_lst, row_data)):
+            text = "" if val is None else str(val)
+            if not text:
+                continue
+            if _NEEDS_TEXT_SETTER(text):
+                table.cell(i, j).text = text
+                continue
+            SubElement(SubElement(tc.txBody.p_lst[0], _A_R), _A_T).text = text
+    return f"Table added to slide {req.slide_index}"
 
 
-@app.post("/pptx/update_slide", response_model=ApiResponse, tags=["PowerPoint"])
-async def pptx_update_slide(req: UpdateSlideContentRequest):
-    """Update title, content, or notes on an existing slide."""
-    from pptx import Presentation
+@app.post("/pptx/add_table", response_model=ApiResponse, tags=["PowerPoint"], dependencies=_NEEDS_PPTX)
+def pptx_add_table(req: AddPptxTableRequest):
+    """Add a table to a specific slide."""
+    return _edit_document(req, load_pptx, _pptx_add_table)
 
-    try:
-        prs = Presentation(req.file_path)
-        if req.slide_index < 0 or req.slide_index >= len(prs.slides):
-            raise HTTPException(status_code=400, detail=f"Slide index {req.slide_index} out of range")
-        slide = prs.slides[req.slide_index]
-        if req.title is not None and slide.shapes.title:
-            slide.shapes.title.text = req.title
-        if req.content is not None and len(slide.placeholders) > 1:
-            slide.placeholders[1].text = req.content
-        if req.notes is not None:
-            slide.notes_slide.notes_text_frame.text = req.notes
-        prs.save(req.file_path)
-        return ApiResponse(message=f"Updated slide {req.slide_index}")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+def _pptx_update_slide(prs: Any, req: UpdateSlideContentRequest) -> str:
+    slide = _get_slide(prs, req.slide_index)
+    if req.title is not None and slide.shapes.title:
+        slide.shapes.title.text = req.title
+    if req.content is not None and len(slide.placeholders) > 1:
+        slide.placeholders[1].text = req.content
+    if req.notes is not None:
+        slide.notes_slide.notes_text_frame.text = req.notes
+    return f"Updated slide {req.slide_index}"
 
 
-@app.post("/pptx/delete_slide", response_model=ApiResponse, tags=["PowerPoint"])
-async def pptx_delete_slide(req: DeleteSlideRequest):
+@app.post("/pptx/update_slide", response_model=ApiResponse, tags=["PowerPoint"], dependencies=_NEEDS_PPTX)
+def pptx_update_slide(req: UpdateSlideContentRequest):
+    """Update title, content, or notes on an existing slide."""
+    return _edit_document(req, load_pptx, _pptx_update_slide)
+
+
+def _pptx_delete_slide(prs: Any, req: DeleteSlideRequest) -> str:
+    sldIdLst = prs.slides._sldIdLst
+    # Snapshot the children once; indexing and del on the lxml element each
+    # rescan them.
+    sld_ids = list(sldIdLst)
+    if not 0 <= req.slide_index < len(sld_ids):
+        raise RequestError(f"Slide index {req.slide_index} out of range")
+    target = sld_ids.pop(req.slide_index)
+    prs.part.drop_rel(target.rId)
+    sldIdLst.remove(target)
+    # python-pptx only renumbers slide parts when a file is opened; do it here
+    # so a later add_slide on the same (cached) object can't reuse a live
+    # slide's part name.
+    prs.part.rename_slide_parts([sldId.rId for sldId in sld_ids])
+    # Relationships look up their target's partname once and cache it (by the
+    # first save at the latest). Drop the cached names so rels to renamed
+    # slides, from the presentation and from notes slides alike, are written
+    # with the new ones.
+    for part in prs.part.package.iter_parts():
+        for rel in part.rels.values():
+            rel.__dict__.pop("target_partname", None)
+            rel.__dict__.pop("target_ref", None)
+    return f"Deleted slide {req.slide_index}"
+
+
+@app.post("/pptx/delete_slide", response_model=ApiResponse, tags=["PowerPoint"], dependencies=_NEEDS_PPTX)
+def pptx_delete_slide(req: DeleteSlideRequest):
     """Delete a slide by index."""
-    from pptx import Presentation
+    return _edit_document(req, load_pptx, _pptx_delete_slide)
 
-    try:
-        prs = Presentation(req.file_path)
-        if req.slide_index < 0 or req.slide_index >= len(prs.slides):
-            raise HTTPException(status_code=400, detail=f"Slide index {req.slide_index} out of range")
-        rId = prs.slides._sldIdLst[req.slide_index].rId
-        prs.part.drop_rel(rId)
-        del prs.slides._sldIdLst[req.slide_index]
-        prs.save(req.file_path)
-        return ApiResponse(message=f"Deleted slide {req.slide_index}")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
+def _pptx_relink(el: Any, src_part: Any, dst_part: Any) -> None:
+    """Repoint relationship ids in an element copied from src_part to dst_part.
 
-@app.post("/pptx/duplicate_slide", response_model=ApiResponse, tags=["PowerPoint"])
-async def pptx_duplicate_slide(req: DuplicateSlideRequest):
+    Copied shapes keep the source slide's rIds (pictures, media, hyperlinks,
+    charts), which mean nothing, or something else, on the new slide. Each
+    target is related from dst_part instead; internal targets are the same
+    part objects, so images and media are shared rather than stored twice.
+    """
+    rid_map: Dict[str, str] = {}
+    for node in el.iter():
+        for name, rid in node.attrib.items():
+            if not name.startswith(_R_ATTR_PREFIX):
+                continue
+            new_rid = rid_map.get(rid)
+            if new_rid is None:
+                rel = src_part.rels.get(rid)
+                if rel is None:
+                    continue
+                if rel.is_external:
+                    new_rid = dst_part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+                else:
+                    new_rid = dst_part.relate_to(rel.target_part, rel.reltype)
+                rid_map[rid] = new_rid
+            node.set(name, new_rid)
+
+
+def _pptx_duplicate_slide(prs: Any, req: DuplicateSlideRequest) -> str:
+    source = _get_slide(prs, req.slide_index)
+    layout = source.slide_layout
+    new_slide = prs.slides.add_slide(layout)
+    # Copy all shapes from source in one lxml clone of the shape tree. Going
+    # through source.shapes builds a proxy object per shape, which costs
+    # several times more than copying the XML. lxml implements deepcopy as a
+    # C-level subtree clone; it measured faster than copy.copy and ~3x faster
+    # than a tostring/fromstring round trip.
+    tree = copy.deepcopy(source.shapes._spTree)
+    _pptx_relink(tree, source.part, new_slide.part)
+    new_slide.shapes._spTree.extend([el for el in tree if el.tag not in _SPTREE_NON_SHAPES])
+    # Remove default placeholder shapes that came with layout
+    # (keep only the copied ones)
+    return f"Duplicated slide {req.slide_index}"
+
+
+@app.post("/pptx/duplicate_slide", response_model=ApiResponse, tags=["PowerPoint"], dependencies=_NEEDS_PPTX)
+def pptx_duplicate_slide(req: DuplicateSlideRequest):
     """Duplicate a slide by index (appended at end)."""
-    from pptx import Presentation
-    from lxml import etree
+    return _edit_document(req, load_pptx, _pptx_duplicate_slide)
 
-    try:
-        prs = Presentation(req.file_path)
-        if req.slide_index < 0 or req.slide_index >= len(prs.slides):
-            raise HTTPException(status_code=400, detail=f"Slide index {req.slide_index} out of range")
-        source = prs.slides[req.slide_index]
-        layout = source.slide_layout
-        new_slide = prs.slides.add_slide(layout)
-        # Copy all shapes from source
-        for shape in source.shapes:
-            el = copy.deepcopy(shape.element)
-            new_slide.shapes._spTree.append(el)
-        # Remove default placeholder shapes that came with layout
-        # (keep only the copied ones)
-        prs.save(req.file_path)
-        return ApiResponse(message=f"Duplicated slide {req.slide_index}")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
+def _pptx_set_notes(prs: Any, req: SetSlideNotesRequest) -> str:
+    slide = _get_slide(prs, req.slide_index)
+    slide.notes_slide.notes_text_frame.text = req.notes
+    return f"Notes set on slide {req.slide_index}"
 
-@app.post("/pptx/set_notes", response_model=ApiResponse, tags=["PowerPoint"])
-async def pptx_set_notes(req: SetSlideNotesRequest):
-    """Set speaker notes on an existing slide."""
-    from pptx import Presentation
 
-    try:
-        prs = Presentation(req.file_path)
-        if req.slide_index < 0 or req.slide_index >= len(prs.slides):
-            raise HTTPException(status_code=400, detail=f"Slide index {req.slide_index} out of range")
-        slide = prs.slides[req.slide_index]
-        slide.notes_slide.notes_text_frame.text = req.notes
-        prs.save(req.file_path)
-        return ApiResponse(message=f"Notes set on slide {req.slide_index}")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+@app.post("/pptx/set_notes", response_model=ApiResponse, tags=["PowerPoint"], dependencies=_NEEDS_PPTX)
+def pptx_set_notes(req: SetSlideNotesRequest):
+    """Set speaker notes on an existing slide."""
+    return _edit_document(req, load_pptx, _pptx_set_notes)
 
 
-@app.post("/pptx/get_slide_info", response_model=ApiResponse, tags=["PowerPoint"])
-async def pptx_get_slide_info(req: GetSlideInfoRequest):
+@app.post("/pptx/get_slide_info", response_model=ApiResponse, tags=["PowerPoint"], dependencies=_NEEDS_PPTX)
+def pptx_get_slide_info(req: GetSlideInfoRequest):
     """Get detailed info about a specific slide."""
-    from pptx import Presentation
-
-    try:
-        prs = Presentation(req.file_path)
-        if req.slide_index < 0 or req.slide_index >= len(prs.slides):
-            raise HTTPException(status_code=400, detail=f"Slide index {req.slide_index} out of range")
-        slide = prs.slides[req.slide_index]
+    with locked_document(req.file_path, read_only=True):
+        prs = load_pptx(req.file_path)
+        slide = _get_slide(prs, req.slide_index)
         shapes_info = []
         for shape in slide.shapes:
             info: Dict[str, Any] = {
@@ -953,66 +1769,69 @@ async def pptx_get_slide_info(req: GetSlideInfoRequest):
         notes = ""
         if slide.has_notes_slide:
             notes = slide.notes_slide.notes_text_frame.text
-        return ApiResponse(
-            message="OK",
-            data={
-                "slide_index": req.slide_index,
-                "shapes": shapes_info,
-                "notes": notes,
-                "layout_name": slide.slide_layout.name,
-            },
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        return ok("OK", {
+            "slide_index": req.slide_index,
+            "shapes": shapes_info,
+            "notes": notes,
+            "layout_name": slide.slide_layout.name,
+        })
+
+
+def _pptx_add_shape(prs: Any, req: AddPptxShapeRequest) -> str:
+    slide = _get_slide(prs, req.slide_index)
+
+    mso = _SHAPE_MAP.get(req.shape_type.lower(), MSO_SHAPE.RECTANGLE)
 
+    left, top, width, height = (int(v * _EMU_PER_INCH) for v in (req.left, req.top, req.width, req.height))
+    shape = slide.shapes.add_shape(mso, left, top, width, height)
+    if req.text:
+        shape.text_frame.text = req.text
+    if req.fill_color:
+        color_hex = req.fill_color.lstrip("#")
+        shape.fill.solid()
+        shape.fill.fore_color.rgb = PptxRGBColor.from_string(color_hex)
+    return f"Shape '{req.shape_type}' added to slide {req.slide_index}"
 
-@app.post("/pptx/add_shape", response_model=ApiResponse, tags=["PowerPoint"])
-async def pptx_add_shape(req: AddPptxShapeRequest):
+
+@app.post("/pptx/add_shape", response_model=ApiResponse, tags=["PowerPoint"], dependencies=_NEEDS_PPTX)
+def pptx_add_shape(req: AddPptxShapeRequest):
     """Add a shape (rectangle, oval, etc.) with optional text to a slide."""
-    from pptx import Presentation
-    from pptx.util import Inches
-    from pptx.enum.shapes import MSO_SHAPE
-    from pptx.dml.color import RGBColor
+    return _edit_document(req, load_pptx, _pptx_add_shape)
+
+
+_PPTX_BATCH_OPS: Dict[str, Tuple[type, Callable[[Any, Any], str]]] = {
+    "add_slide": (AddSlideRequest, _pptx_add_slide),
+    "add_table": (AddPptxTableRequest, _pptx_add_table),
+    "update_slide": (UpdateSlideContentRequest, _pptx_update_slide),
+    "delete_slide": (DeleteSlideRequest, _pptx_delete_slide),
+    "duplicate_slide": (DuplicateSlideRequest, _pptx_duplicate_slide),
+    "set_notes": (SetSlideNotesRequest, _pptx_set_notes),
+    "add_shape": (AddPptxShapeRequest, _pptx_add_shape),
+}
 
-    try:
-        prs = Presentation(req.file_path)
-        if req.slide_index < 0 or req.slide_index >= len(prs.slides):
-            raise HTTPException(status_code=400, detail=f"Slide index {req.slide_index} out of range")
-        slide = prs.slides[req.slide_index]
-
-        shape_map = {
-            "rectangle": MSO_SHAPE.RECTANGLE,
-            "rounded_rectangle": MSO_SHAPE.ROUNDED_RECTANGLE,
-            "oval": MSO_SHAPE.OVAL,
-            "triangle": MSO_SHAPE.ISOSCELES_TRIANGLE,
-            "diamond": MSO_SHAPE.DIAMOND,
-            "pentagon": MSO_SHAPE.PENTAGON,
-            "hexagon": MSO_SHAPE.HEXAGON,
-            "cloud": MSO_SHAPE.CLOUD,
-            "star": MSO_SHAPE.STAR_5_POINT,
-            "arrow_right": MSO_SHAPE.RIGHT_ARROW,
-            "arrow_left": MSO_SHAPE.LEFT_ARROW,
-        }
-        mso = shape_map.get(req.shape_type.lower(), MSO_SHAPE.RECTANGLE)
-
-        shape = slide.shapes.add_shape(
-            mso, Inches(req.left), Inches(req.top), Inches(req.width), Inches(req.height),
-        )
-        if req.text:
-            shape.text_frame.text = req.text
-        if req.fill_color:
-            color_hex = req.fill_color.lstrip("#")
-            shape.fill.solid()
-            shape.fill.fore_color.rgb = RGBColor.from_string(color_hex)
-
-        prs.save(req.file_path)
-        return ApiResponse(message=f"Shape '{req.shape_type}' added to slide {req.slide_index}")
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+
+def _new_pptx() -> Any:
+    return Presentation()
+
+
+def _pptx_batch_sync(req: PptxBatchRequest) -> Response:
+    return _run_batch(req, load_pptx, _new_pptx, _PPTX_BATCH_OPS)
+
+
+@app.post("/pptx/batch", response_model=ApiResponse, tags=["PowerPoint"], dependencies=_NEEDS_PPTX)
+async def pptx_batch(req: PptxBatchRequest):
+    """Apply several edits to a presentation with a single load and save."""
+    if req.create_if_missing:
+        await ensure_dir(req.file_path)
+    return await _offload(_pptx_batch_sync, req)
+
+
+@app.post("/pptx/flush", response_model=ApiResponse, tags=["PowerPoint"], dependencies=_NEEDS_PPTX)
+def pptx_flush(req: FlushPptxRequest):
+    """Save edits made with commit=false."""
+    if flush_document(req.file_path):
+        return ok(f"Saved {req.file_path}")
+    return ok(f"No pending changes for {req.file_path}")
 
 
 # ── Health check ─────────────────────────────────────────────
@@ -1031,4 +1850,21 @@ if __name__ == "__main__":
         idx = sys.argv.index("--port")
         if idx + 1 < len(sys.argv):
             port = int(sys.argv[idx + 1])
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Document work is CPU-bound under the GIL, so scale with processes; keep
+    # at least two so one slow save doesn't stall a single-CPU VM.
+    workers = max(2, os.cpu_count() or 1)
+    if "--workers" in sys.argv:
+        idx = sys.argv.index("--workers")
+        if idx + 1 < len(sys.argv):
+            workers = int(sys.argv[idx + 1])
+    os.environ[WORKERS_ENV] = str(workers)
+    uvicorn.run(
+        "main:app",
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host="0.0.0.0",
+        port=port,
+        workers=workers,
+        # uvloop has no Windows support.
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+    )
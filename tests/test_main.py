@@ -0,0 +1,382 @@
+import io
+import os
+import stat
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from openpyxl import Workbook, load_workbook
+from docx import Document
+from openpyxl.drawing.image import Image as XlsxImage
+from PIL import Image as PILImage
+from pptx import Presentation
+
+import main
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    yield
+    main._doc_cache.clear()
+    main._dirty_docs.clear()
+    main._read_cache.clear()
+
+
+@pytest.fixture
+def client():
+    with TestClient(main.app, raise_server_exceptions=False) as c:
+        yield c
+
+
+def post(client, url, **body):
+    r = client.post(url, json=body)
+    assert r.status_code == 200, r.text
+    return r.json()
+
+
+def slide_titles(path):
+    return [slide.shapes.title.text for slide in Presentation(path).slides]
+
+
+# ── Request validation ───────────────────────────────────────
+
+
+@pytest.mark.parametrize("url, body", [
+    ("/excel/write_data", {"sheet_name": "S1", "rows": [[{"a": 1}]]}),
+    ("/excel/create", {"sheets": [{"name": "S1", "rows": [[[1, 2]]]}]}),
+    ("/word/add_table", {"rows": [[{"a": 1}]]}),
+    ("/pptx/add_table", {"slide_index": 0, "rows": [[[1]]]}),
+])
+def test_non_scalar_cells_are_rejected(client, tmp_path, url, body):
+    r = client.post(url, json={"file_path": str(tmp_path / "f"), **body})
+    assert r.status_code == 422, r.text
+
+
+# ── Word ─────────────────────────────────────────────────────
+
+
+def test_search_replace_across_runs_keeps_other_content(client, tmp_path):
+    path = str(tmp_path / "doc.docx")
+    png = io.BytesIO()
+    PILImage.new("RGB", (4, 4)).save(png, "png")
+    doc = Document()
+    para = doc.add_paragraph()
+    para.add_run("Hel").bold = True
+    para.add_run("lo ")
+    para.add_run().add_picture(png)
+    para.add_run(" tail").italic = True
+    doc.add_paragraph("Hello again, Hello")
+    doc.save(path)
+
+    r = post(client, "/word/search_replace", file_path=path, search="Hello", replace="Bye")
+    assert r["message"] == "Replaced 3 occurrence(s)"
+    doc = Document(path)
+    runs = doc.paragraphs[0].runs
+    assert [(run.text, run.bold, run.italic) for run in runs] == [
+        ("Bye", True, None), (" ", None, None), ("", None, None), (" tail", None, True),
+    ]
+    assert len(doc.inline_shapes) == 1
+    assert doc.paragraphs[1].text == "Bye again, Bye"
+
+
+@pytest.mark.skipif(os.name == "nt", reason="POSIX permissions and symlinks")
+def test_save_keeps_symlink_and_mode(client, tmp_path):
+    real = tmp_path / "real.docx"
+    link = tmp_path / "link.docx"
+    post(client, "/word/create", file_path=str(real), paragraphs=["one"])
+    os.chmod(real, 0o600)
+    link.symlink_to(real)
+    post(client, "/word/add_content", file_path=str(link), paragraphs=["two"])
+    assert link.is_symlink()
+    assert stat.S_IMODE(real.stat().st_mode) == 0o600
+    assert [p.text for p in Document(str(real)).paragraphs] == ["one", "two"]
+
+
+def test_external_save_during_parse_is_not_masked(client, tmp_path, monkeypatch):
+    path = str(tmp_path / "doc.docx")
+    post(client, "/word/create", file_path=path, paragraphs=["old"])
+    main.evict_cached(path)
+    parse = main.Document
+
+    def parse_then_external_save(p):
+        doc = parse(p)
+        newer = parse(p)
+        newer.add_paragraph("saved elsewhere")
+        newer.save(p)
+        return doc
+
+    monkeypatch.setattr(main, "Document", parse_then_external_save)
+    post(client, "/word/read", file_path=path)
+    monkeypatch.setattr(main, "Document", parse)
+    r = post(client, "/word/read", file_path=path)
+    assert r["data"]["paragraphs"] == ["old", "saved elsewhere"]
+
+
+def test_expired_documents_are_dropped_on_lookup(client, tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(main, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    a, b = str(tmp_path / "a.docx"), str(tmp_path / "b.docx")
+    post(client, "/word/create", file_path=a)
+    clock[0] += main.DOC_CACHE_TTL / 2
+    post(client, "/word/create", file_path=b)
+    clock[0] += main.DOC_CACHE_TTL * 0.75
+    # b is still fresh, so this is a cache hit; a has expired meanwhile.
+    post(client, "/word/read", file_path=b)
+    assert main._cache_key(b) in main._doc_cache
+    assert main._cache_key(a) not in main._doc_cache
+
+
+def test_word_table_null_cells_are_empty(client, tmp_path):
+    path = str(tmp_path / "doc.docx")
+    post(client, "/word/create", file_path=path)
+    post(client, "/word/add_table", file_path=path, headers=["a", "b"], rows=[[None, 1]])
+    assert [c.text for c in Document(path).tables[0].rows[1].cells] == ["", "1"]
+
+
+def test_word_batch_applies_ops_in_order(client, tmp_path):
+    path = str(tmp_path / "doc.docx")
+    r = post(client, "/word/batch", file_path=path, ops=[
+        {"op": "add_heading", "args": {"text": "Title", "level": 1}},
+        {"op": "add_paragraph", "args": {"text": "draft one"}},
+        {"op": "add_paragraph", "args": {"text": "draft two"}},
+        {"op": "search_replace", "args": {"search": "draft", "replace": "final"}},
+        {"op": "delete_paragraph", "args": {"paragraph_index": 1}},
+        {"op": "add_paragraph", "args": {"text": "draft three"}},
+    ])
+    assert len(r["data"]["results"]) == 6
+    assert [p.text for p in Document(path).paragraphs] == ["Title", "final two", "draft three"]
+
+
+def test_word_batch_create_if_missing(client, tmp_path):
+    path = tmp_path / "doc.docx"
+    ops = [{"op": "add_paragraph", "args": {"text": "one"}}]
+    r = client.post("/word/batch", json={"file_path": str(path), "create_if_missing": False, "ops": ops})
+    assert r.status_code == 500, r.text
+    assert "No such file" in r.json()["detail"]
+    assert not path.exists()
+    post(client, "/word/batch", file_path=str(path), create_if_missing=True, ops=ops)
+    # An existing file is edited, not replaced by a fresh document.
+    post(client, "/word/batch", file_path=str(path), ops=[{"op": "add_paragraph", "args": {"text": "two"}}])
+    assert [p.text for p in Document(str(path)).paragraphs] == ["one", "two"]
+
+
+def test_word_batch_failure_leaves_file_untouched(client, tmp_path):
+    path = tmp_path / "doc.docx"
+    post(client, "/word/create", file_path=str(path), paragraphs=["one"])
+    before = path.read_bytes()
+    r = client.post("/word/batch", json={"file_path": str(path), "ops": [
+        {"op": "add_paragraph", "args": {"text": "two"}},
+        {"op": "format", "args": {"paragraph_index": 99, "bold": True}},
+    ]})
+    assert r.status_code == 400, r.text
+    assert r.json()["detail"].startswith("Operation 1 (format)")
+    assert path.read_bytes() == before
+    # The half-applied document isn't served from the cache either.
+    assert post(client, "/word/read", file_path=str(path))["data"]["paragraphs"] == ["one"]
+
+
+# ── Excel ────────────────────────────────────────────────────
+
+
+def test_workbook_with_image_survives_repeated_edits(client, tmp_path):
+    path = str(tmp_path / "book.xlsx")
+    png = io.BytesIO()
+    PILImage.new("RGB", (4, 4)).save(png, "png")
+    wb = Workbook()
+    wb.active.title = "S1"
+    wb.active.add_image(XlsxImage(png), "C3")
+    wb.save(path)
+    for cell in ("A1", "A2", "A3"):
+        post(client, "/excel/apply_formula", file_path=path, sheet_name="S1", cell=cell, formula="=1+1")
+    ws = load_workbook(path)["S1"]
+    assert [ws[c].value for c in ("A1", "A2", "A3")] == ["=1+1"] * 3
+    assert len(ws._images) == 1
+
+
+def test_excel_batch_applies_ops_in_order(client, tmp_path):
+    path = str(tmp_path / "book.xlsx")
+    post(client, "/excel/batch", file_path=path, create_if_missing=True, ops=[
+        {"op": "write_data", "args": {"sheet_name": "Data", "headers": ["n"], "rows": [[1], [2]]}},
+        {"op": "rename_sheet", "args": {"sheet_name": "Data", "new_name": "Final"}},
+        {"op": "apply_formula", "args": {"sheet_name": "Final", "cell": "A4", "formula": "=SUM(A2:A3)"}},
+        {"op": "write_data", "args": {"sheet_name": "Final", "headers": ["total"]}},
+    ])
+    wb = load_workbook(path)
+    assert "Data" not in wb.sheetnames
+    assert [c.value for c in wb["Final"]["A"]] == ["total", 1, 2, "=SUM(A2:A3)"]
+
+
+def test_excel_batch_failure_leaves_file_untouched(client, tmp_path):
+    path = tmp_path / "book.xlsx"
+    post(client, "/excel/create", file_path=str(path), sheets=[{"name": "S1", "rows": [[1]]}])
+    before = path.read_bytes()
+    r = client.post("/excel/batch", json={"file_path": str(path), "create_if_missing": False, "ops": [
+        {"op": "apply_formula", "args": {"sheet_name": "S1", "cell": "B1", "formula": "=A1"}},
+        {"op": "apply_formula", "args": {"sheet_name": "Missing", "cell": "A1", "formula": "=1"}},
+    ]})
+    assert r.status_code == 400, r.text
+    assert path.read_bytes() == before
+    assert load_workbook(str(path))["S1"]["B1"].value is None
+
+
+# ── PowerPoint ───────────────────────────────────────────────
+
+
+def test_delete_slide_after_save_reopens(client, tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    post(client, "/pptx/create", file_path=path, slides=[
+        {"title": "one", "notes": "n1"}, {"title": "two", "notes": "n2"}, {"title": "three"},
+    ])
+    post(client, "/pptx/delete_slide", file_path=path, slide_index=0)
+    assert slide_titles(path) == ["two", "three"]
+    assert Presentation(path).slides[0].notes_slide.notes_text_frame.text == "n2"
+
+
+def test_cached_presentation_stays_valid_after_delete(client, tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    post(client, "/pptx/create", file_path=path, slides=[{"title": t} for t in ("one", "two", "three")])
+    post(client, "/pptx/delete_slide", file_path=path, slide_index=1)
+    post(client, "/pptx/add_slide", file_path=path, title="four")
+    post(client, "/pptx/update_slide", file_path=path, slide_index=2, title="FOUR")
+    post(client, "/pptx/delete_slide", file_path=path, slide_index=0)
+    post(client, "/pptx/batch", file_path=path, ops=[
+        {"op": "delete_slide", "args": {"slide_index": 0}},
+        {"op": "add_slide", "args": {"title": "five"}},
+    ])
+    assert slide_titles(path) == ["FOUR", "five"]
+
+
+def test_pptx_table_null_cells_are_empty(client, tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    post(client, "/pptx/create", file_path=path, slides=[{"title": "one"}])
+    post(client, "/pptx/add_table", file_path=path, slide_index=0, headers=["a", "b"], rows=[[None, 1]])
+    table = next(s for s in Presentation(path).slides[0].shapes if s.has_table).table
+    assert [table.cell(1, j).text for j in range(2)] == ["", "1"]
+
+
+def test_pptx_batch_failure_leaves_file_untouched(client, tmp_path):
+    path = tmp_path / "deck.pptx"
+    post(client, "/pptx/create", file_path=str(path), slides=[{"title": "one"}])
+    before = path.read_bytes()
+    r = client.post("/pptx/batch", json={"file_path": str(path), "ops": [
+        {"op": "add_slide", "args": {"title": "two"}},
+        {"op": "delete_slide", "args": {"slide_index": 0}},
+        {"op": "update_slide", "args": {"slide_index": 5, "title": "x"}},
+    ]})
+    assert r.status_code == 400, r.text
+    assert path.read_bytes() == before
+    post(client, "/pptx/add_slide", file_path=str(path), title="three")
+    assert slide_titles(str(path)) == ["one", "three"]
+
+
+def notes(path, index):
+    return Presentation(path).slides[index].notes_slide.notes_text_frame.text
+
+
+def test_invalid_request_keeps_deferred_edits(client, tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    post(client, "/pptx/create", file_path=path, slides=[{"title": "one"}])
+    post(client, "/pptx/set_notes", file_path=path, slide_index=0, notes="later", commit=False)
+    assert client.post("/pptx/get_slide_info", json={"file_path": path, "slide_index": 7}).status_code == 400
+    assert client.post("/pptx/set_notes", json={
+        "file_path": path, "slide_index": 7, "notes": "x", "commit": False,
+    }).status_code == 400
+    assert post(client, "/pptx/flush", file_path=path)["message"] == f"Saved {path}"
+    assert notes(path, 0) == "later"
+
+
+def test_deferred_edits_conflict_with_changes_on_disk(client, tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    post(client, "/pptx/create", file_path=path, slides=[{"title": "one"}])
+    post(client, "/pptx/set_notes", file_path=path, slide_index=0, notes="stale", commit=False)
+    # Another process saves the file in the meantime.
+    prs = Presentation(path)
+    prs.slides[0].notes_slide.notes_text_frame.text = "newer"
+    prs.save(path)
+    r = client.post("/pptx/flush", json={"file_path": path})
+    assert r.status_code == 409, r.text
+    assert notes(path, 0) == "newer"
+    assert post(client, "/pptx/flush", file_path=path)["message"] == f"No pending changes for {path}"
+
+
+def test_deferred_commit_refused_with_several_workers(client, tmp_path, monkeypatch):
+    path = str(tmp_path / "deck.pptx")
+    post(client, "/pptx/create", file_path=path, slides=[{"title": "one"}])
+    monkeypatch.setenv(main.WORKERS_ENV, "2")
+    r = client.post("/pptx/set_notes", json={"file_path": path, "slide_index": 0, "notes": "x", "commit": False})
+    assert r.status_code == 400, r.text
+    post(client, "/pptx/set_notes", file_path=path, slide_index=0, notes="now")
+    assert notes(path, 0) == "now"
+
+
+# ── Conditional reads ────────────────────────────────────────
+
+
+def test_matching_if_none_match_returns_304(client, tmp_path):
+    path = str(tmp_path / "doc.docx")
+    post(client, "/word/create", file_path=path, paragraphs=["one"])
+    r = client.post("/word/read", json={"file_path": path})
+    etag = r.headers["etag"]
+    for header in (etag, "W/" + etag, '"other", ' + etag, "*"):
+        r = client.post("/word/read", json={"file_path": path}, headers={"If-None-Match": header})
+        assert r.status_code == 304, header
+        assert r.headers["etag"] == etag
+        assert r.content == b""
+    r = client.post("/word/read", json={"file_path": path}, headers={"If-None-Match": '"other"'})
+    assert r.status_code == 200
+    assert r.json()["data"]["paragraphs"] == ["one"]
+
+
+def test_edit_changes_the_etag(client, tmp_path):
+    path = str(tmp_path / "book.xlsx")
+    post(client, "/excel/create", file_path=path, sheets=[{"name": "S1", "rows": [[1]]}])
+    body = {"file_path": path, "sheet_name": "S1"}
+    etag = client.post("/excel/read", json=body).headers["etag"]
+    post(client, "/excel/apply_formula", file_path=path, sheet_name="S1", cell="B1", formula="=A1")
+    r = client.post("/excel/read", json=body, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+
+
+def test_read_options_get_their_own_etag(client, tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    post(client, "/pptx/create", file_path=path, slides=[{"title": "one", "content": "body"}])
+    joined = client.post("/pptx/read", json={"file_path": path, "joined": True})
+    split = client.post("/pptx/read", json={"file_path": path, "joined": False})
+    assert joined.headers["etag"] != split.headers["etag"]
+    r = client.post("/pptx/read", json={"file_path": path, "joined": False},
+                    headers={"If-None-Match": joined.headers["etag"]})
+    assert r.status_code == 200
+    assert isinstance(r.json()["data"]["slides"][0]["text"], list)
+
+
+def test_no_etag_while_deferred_edits_are_pending(client, tmp_path):
+    path = str(tmp_path / "deck.pptx")
+    post(client, "/pptx/create", file_path=path, slides=[{"title": "one"}])
+    etag = client.post("/pptx/read", json={"file_path": path}).headers["etag"]
+    post(client, "/pptx/set_notes", file_path=path, slide_index=0, notes="later", commit=False)
+    r = client.post("/pptx/read", json={"file_path": path}, headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert "etag" not in r.headers
+    assert r.json()["data"]["slides"][0]["notes"] == "later"
+    post(client, "/pptx/flush", file_path=path)
+    assert client.post("/pptx/read", json={"file_path": path}).headers["etag"] != etag
+
+
+def test_file_changed_during_read_is_not_cached(client, tmp_path, monkeypatch):
+    path = str(tmp_path / "doc.docx")
+    post(client, "/word/create", file_path=path, paragraphs=["old"])
+    read = main._word_read_data
+
+    def read_then_external_save(req):
+        data = read(req)
+        doc = Document(path)
+        doc.add_paragraph("new")
+        doc.save(path)
+        return data
+
+    monkeypatch.setattr(main, "_word_read_data", read_then_external_save)
+    r = client.post("/word/read", json={"file_path": path})
+    assert "etag" not in r.headers
+    monkeypatch.setattr(main, "_word_read_data", read)
+    assert post(client, "/word/read", file_path=path)["data"]["paragraphs"] == ["old", "new"]